@@ -3,7 +3,7 @@ from copy import deepcopy
 from datetime import datetime
 from functools import partial, wraps
 from logging import getLogger
-from typing import Any, Protocol
+from typing import Any, Callable, Protocol
 
 from fastapi import HTTPException, status
 from requests import HTTPError, ReadTimeout
@@ -39,6 +39,7 @@ class DoDeployFuncType(Protocol):
         deployment: Deployment,
         storage: Storage,
         runtime: Runtime,
+        now: Callable[[], datetime] = ...,
     ) -> None: ...
 
 
@@ -85,6 +86,7 @@ def handle_deployment_exception(
         deployment: Deployment,
         storage: Storage,
         runtime: Runtime,
+        now: Callable[[], datetime] = datetime.now,
     ) -> None:
         try:
             return func(
@@ -93,6 +95,7 @@ def handle_deployment_exception(
                 deployment=deployment,
                 storage=storage,
                 runtime=runtime,
+                now=now,
             )
 
         except DeployCancelled:
@@ -193,6 +196,7 @@ def _wait_for_builds(
     runtime: Runtime,
     storage: Storage,
     deployment_id: str,
+    now: Callable[[], datetime],
 ) -> None:
     settings = get_settings()
     pending_builds: dict[str, DeploymentBuildInfo] = {
@@ -206,11 +210,10 @@ def _wait_for_builds(
     }
     logger.debug(f"Waiting for {len(pending_builds)} builds to finish... from {builds}")
 
-    start_time = datetime.now()
+    start_time = now()
     while (
         pending_builds
-        and (datetime.now() - start_time).total_seconds()
-        < settings.build_timeout_seconds
+        and (now() - start_time).total_seconds() < settings.build_timeout_seconds
     ):
         to_delete = []
         for component_name, build in pending_builds.items():
@@ -353,6 +356,7 @@ def _do_build(
     runtime: Runtime,
     storage: Storage,
     deployment_id: str,
+    now: Callable[[], datetime],
 ) -> None:
     logger.debug(f"Starting builds for tool {tool_name}")
     _raise_if_cancelled(
@@ -373,6 +377,7 @@ def _do_build(
         runtime=runtime,
         storage=storage,
         deployment_id=deployment_id,
+        now=now,
     )
     logger.debug(f"Builds done for tool {tool_name}")
 
@@ -383,6 +388,7 @@ def _do_run(
     deployment: Deployment,
     storage: Storage,
     runtime: Runtime,
+    now: Callable[[], datetime],
 ) -> None:
     for component_name, component_info in components.items():
         run_info = DeploymentRunInfo(run_status=DeploymentRunState.pending)
@@ -473,7 +479,7 @@ def _do_run(
         _update_deployment(storage=storage, tool_name=tool_name, deployment=deployment)
 
     deployment.status = DeploymentState.successful
-    deployment.long_status = f"Finished at {datetime.now()}"
+    deployment.long_status = f"Finished at {now()}"
     _update_deployment(storage=storage, tool_name=tool_name, deployment=deployment)
 
 
@@ -485,11 +491,12 @@ def do_deploy(
     deployment: Deployment,
     storage: Storage,
     runtime: Runtime,
+    now: Callable[[], datetime] = datetime.now,
 ) -> None:
     logger.info(f"Starting deployment for tool {tool_name}")
 
     deployment.status = DeploymentState.running
-    deployment.long_status = f"Started at {datetime.now()}"
+    deployment.long_status = f"Started at {now()}"
     _update_deployment(storage=storage, tool_name=tool_name, deployment=deployment)
 
     _update_build_info_func = partial(
@@ -506,6 +513,7 @@ def do_deploy(
         deployment_id=deployment.deploy_id,
         runtime=runtime,
         storage=storage,
+        now=now,
     )
     _raise_if_cancelled(
         storage=storage, tool_name=tool_name, deployment_id=deployment.deploy_id
@@ -516,4 +524,5 @@ def do_deploy(
         deployment=deployment,
         storage=storage,
         runtime=runtime,
+        now=now,
     )
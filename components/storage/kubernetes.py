@@ -1,6 +1,6 @@
 import datetime
 import logging
-from typing import Any
+from typing import Any, Callable
 
 import kubernetes  # type: ignore
 from fastapi import status
@@ -230,7 +230,11 @@ class KubernetesStorage(Storage):
                 f"Got unexpected error ({error}) when trying to list deployments for {tool_name}"
             ) from error
 
-    def _timeout_old_deployments(self, tool_name: str) -> None:
+    def _timeout_old_deployments(
+        self,
+        tool_name: str,
+        now: Callable[[], datetime.datetime] = datetime.datetime.now,
+    ) -> None:
         settings = get_settings()
         logger.debug("Timing out old deployments for tool %s", tool_name)
         tool_deployments = self._list_deployments(tool_name)
@@ -240,10 +244,10 @@ class KubernetesStorage(Storage):
             reverse=True,
         )
 
+        current_time = now()
+
         def elapsed(datestamp: str) -> datetime.timedelta:
-            return datetime.datetime.now() - datetime.datetime.strptime(
-                datestamp, "%Y%m%d-%H%M%S"
-            )
+            return current_time - datetime.datetime.strptime(datestamp, "%Y%m%d-%H%M%S")
 
         to_time_out = [
             deployment
@@ -1,4 +1,5 @@
 import logging
+from dataclasses import dataclass
 
 from ..models.api_models import Deployment, DeployToken, ToolConfig
 from .base import Storage
@@ -7,70 +8,98 @@ from .exceptions import NotFoundInStorage
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class _ToolEntry:
+    config: ToolConfig | None = None
+    token: DeployToken | None = None
+    # None means the tool never had any deployments created
+    deployments: dict[str, Deployment] | None = None
+
+
 class MockStorage(Storage):
     def __init__(self) -> None:
-        self._tool_configs: dict[str, ToolConfig] = {}
-        self._per_tool_deployments: dict[str, dict[str, Deployment]] = {}
-        self._deploy_tokens: dict[str, DeployToken] = {}
+        self._tools: dict[str, _ToolEntry] = {}
         logger.info("MockStorage initialized.")
 
+    def _get_or_create_entry(self, tool_name: str) -> _ToolEntry:
+        entry = self._tools.get(tool_name)
+        if entry is None:
+            entry = self._tools[tool_name] = _ToolEntry()
+        return entry
+
+    def _drop_entry_if_empty(self, tool_name: str, entry: _ToolEntry) -> None:
+        if entry.config is None and entry.token is None and entry.deployments is None:
+            del self._tools[tool_name]
+
     def get_tool_config(self, tool_name: str) -> ToolConfig:
         logger.info(f"Attempting to get config for tool: {tool_name}")
-        if tool_name not in self._tool_configs:
+        entry = self._tools.get(tool_name)
+        if entry is None or entry.config is None:
             raise NotFoundInStorage(f"No configuration found for tool: {tool_name}")
-        return self._tool_configs[tool_name]
+        return entry.config
 
     def set_tool_config(self, tool_name: str, config: ToolConfig) -> None:
         logger.info(f"Setting config for tool: {tool_name}")
-        self._tool_configs[tool_name] = config
+        self._get_or_create_entry(tool_name).config = config
 
     def delete_tool_config(self, tool_name: str) -> ToolConfig:
         logger.info(f"Deleting config for tool: {tool_name}")
-        if tool_name not in self._tool_configs:
+        entry = self._tools.get(tool_name)
+        if entry is None or entry.config is None:
             raise NotFoundInStorage(f"No configuration found for tool: {tool_name}")
-        return self._tool_configs.pop(tool_name)
+        config, entry.config = entry.config, None
+        self._drop_entry_if_empty(tool_name=tool_name, entry=entry)
+        return config
 
     def get_deployment(self, tool_name: str, deployment_name: str) -> Deployment:
+        entry = self._tools.get(tool_name)
+        if entry is None or entry.deployments is None:
+            raise NotFoundInStorage(
+                f"Deployment {deployment_name} not found for tool: {tool_name}"
+            )
         try:
-            return self._per_tool_deployments[tool_name][deployment_name]
+            return entry.deployments[deployment_name]
         except KeyError as error:
             raise NotFoundInStorage(
                 f"Deployment {deployment_name} not found for tool: {tool_name}"
             ) from error
 
     def list_deployments(self, tool_name: str) -> list[Deployment]:
-        if tool_name in self._per_tool_deployments:
-            return list(self._per_tool_deployments[tool_name].values())
-        else:
+        entry = self._tools.get(tool_name)
+        if entry is None or entry.deployments is None:
             raise NotFoundInStorage(f"No deployments found for tool: {tool_name}")
+        return list(entry.deployments.values())
 
     def create_deployment(self, tool_name: str, deployment: Deployment) -> None:
-        if tool_name not in self._per_tool_deployments:
-            self._per_tool_deployments[tool_name] = {}
+        entry = self._get_or_create_entry(tool_name)
+        if entry.deployments is None:
+            entry.deployments = {}
 
-        self._per_tool_deployments[tool_name][deployment.deploy_id] = deployment
+        entry.deployments[deployment.deploy_id] = deployment
 
     def update_deployment(self, tool_name: str, deployment: Deployment) -> None:
-        if tool_name not in self._per_tool_deployments:
+        entry = self._tools.get(tool_name)
+        if entry is None or entry.deployments is None:
             raise NotFoundInStorage(
                 f"The tool {tool_name} has no deployments, can't update {deployment}"
             )
 
-        if deployment.deploy_id not in self._per_tool_deployments[tool_name]:
+        if deployment.deploy_id not in entry.deployments:
             raise NotFoundInStorage(
-                f"The tool {tool_name} has no deployment with id {deployment.deploy_id}, it has {self._per_tool_deployments[tool_name]}"
+                f"The tool {tool_name} has no deployment with id {deployment.deploy_id}, it has {entry.deployments}"
             )
 
-        self._per_tool_deployments[tool_name][deployment.deploy_id] = deployment
+        entry.deployments[deployment.deploy_id] = deployment
 
     def delete_deployment(self, tool_name: str, deployment_name: str) -> Deployment:
         logger.info(f"Deleting deployment: {deployment_name} for tool: {tool_name}")
-        if tool_name not in self._per_tool_deployments:
+        entry = self._tools.get(tool_name)
+        if entry is None or entry.deployments is None:
             raise NotFoundInStorage(
                 f"Deployment {deployment_name} not found for tool: {tool_name}"
             )
         try:
-            return self._per_tool_deployments[tool_name].pop(deployment_name)
+            return entry.deployments.pop(deployment_name)
         except KeyError:
             raise NotFoundInStorage(
                 f"Deployment {deployment_name} not found for tool: {tool_name}"
@@ -78,7 +107,8 @@ class MockStorage(Storage):
 
     def get_deploy_token(self, tool_name: str) -> DeployToken:
         logger.info(f"Retrieving deploy token for tool: {tool_name}")
-        token = self._deploy_tokens.get(tool_name)
+        entry = self._tools.get(tool_name)
+        token = entry.token if entry is not None else None
         if not token:
             logger.warning(f"No deploy token found for tool: {tool_name}")
             raise NotFoundInStorage(f"No deploy token found for tool: {tool_name}")
@@ -87,13 +117,15 @@ class MockStorage(Storage):
 
     def set_deploy_token(self, tool_name: str, token: DeployToken) -> None:
         logger.info(f"Setting deploy token for tool: {tool_name}")
-        self._deploy_tokens[tool_name] = token
+        self._get_or_create_entry(tool_name).token = token
         logger.info(f"Deploy token set for tool: {tool_name}")
 
     def delete_deploy_token(self, tool_name: str) -> DeployToken:
         logger.info(f"Deleting deploy token for tool: {tool_name}")
-        if tool_name not in self._deploy_tokens:
+        entry = self._tools.get(tool_name)
+        if entry is None or entry.token is None:
             raise NotFoundInStorage(f"No deploy token found for tool: {tool_name}")
-        token = self._deploy_tokens.pop(tool_name)
+        token, entry.token = entry.token, None
+        self._drop_entry_if_empty(tool_name=tool_name, entry=entry)
         logger.info(f"Deploy token deleted for tool: {tool_name}")
         return token
@@ -1,73 +1,210 @@
+import json
 import logging
+import socket
+from types import SimpleNamespace
 from typing import Generator
 from unittest.mock import MagicMock
 
 import kubernetes
 import pytest
-from fastapi import FastAPI, status
+import requests
+import yaml
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from toolforge_weld.api_client import ToolforgeClient
 from toolforge_weld.kubernetes_config import Kubeconfig
 
 import components.deploy_task
 import components.runtime.toolforge
 import components.settings
+from components.gen.toolforge_models import BuildsBuildStatus
 from components.main import create_app
+from components.models.api_models import Deployment, ToolConfig
+from components.runtime.base import Runtime
+from components.runtime.utils import get_runtime
 from components.settings import Settings
+from components.storage.base import Storage
 from components.storage.utils import get_storage
+from tests.helpers import DEFAULT_FAKE_TOOL_CONFIG_JSON, get_fake_tool_config
+from tests.testlibs import (
+    JOB_RESPONSE,
+    FakeToolforgeClient,
+    get_deployment_from_tool_config,
+    get_tool_config,
+)
 
 logger = logging.getLogger(__name__)
 
+_FAKE_CONFIG_YAML = yaml.safe_dump(json.loads(DEFAULT_FAKE_TOOL_CONFIG_JSON))
 
-@pytest.fixture
-def app() -> FastAPI:
+
+@pytest.fixture(scope="session")
+def settings() -> Settings:
     settings = Settings(log_level="debug", runtime_type="toolforge")
     components.settings.settings = settings
-    app = create_app(settings=settings)
-    # force creating a new storage
-    get_storage(settings=settings, rebuild_storage=True)
-    return app
+    return settings
+
+
+@pytest.fixture(scope="session")
+def app(settings: Settings) -> FastAPI:
+    return create_app(settings=settings)
+
+
+@pytest.fixture(scope="session")
+def runtime(settings: Settings) -> Runtime:
+    # the runtime gets its client on every call, so it's safe to share
+    return get_runtime(settings=settings)
+
+
+@pytest.fixture(autouse=True)
+def storage(settings: Settings) -> Storage:
+    # the app is shared by the whole session, so force creating a new storage for each test
+    return get_storage(settings=settings, rebuild_storage=True)
+
+
+@pytest.fixture
+def seeded_tool(storage: Storage) -> ToolConfig:
+    # stored directly, for tests that don't exercise creating it through the api
+    tool_config = get_fake_tool_config()
+    storage.set_tool_config(tool_name="test-tool-1", config=tool_config)
+    return tool_config
 
 
 @pytest.fixture
-def test_client(app) -> Generator[TestClient, None, None]:
+def seeded_deployment(storage: Storage, seeded_tool: ToolConfig) -> Deployment:
+    # stored directly, for tests that don't exercise creating it through the api
+    deployment = get_deployment_from_tool_config(
+        tool_config=seeded_tool,
+        deploy_id="20210601-000000-seeded",
+        creation_time="20210601-000000",
+    )
+    storage.create_deployment(tool_name="test-tool-1", deployment=deployment)
+    return deployment
+
+
+@pytest.fixture(scope="session")
+def _base_deployment() -> Deployment:
+    return get_deployment_from_tool_config(tool_config=get_tool_config())
+
+
+@pytest.fixture
+def my_tool_config() -> ToolConfig:
+    return get_tool_config()
+
+
+@pytest.fixture
+def my_deployment(_base_deployment: Deployment) -> Deployment:
+    # tests modify the deployment, so each gets its own copy
+    return _base_deployment.model_copy(deep=True)
+
+
+@pytest.fixture
+def my_storage(storage: Storage, my_deployment: Deployment) -> Storage:
+    # the deploy tests' default deployment, stored for "my-tool"
+    storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
+    return storage
+
+
+@pytest.fixture(scope="session")
+def _session_client(app: FastAPI) -> Generator[TestClient, None, None]:
     with TestClient(app) as client:
         yield client
 
 
+@pytest.fixture
+def test_client(_session_client: TestClient) -> Generator[TestClient, None, None]:
+    headers = _session_client.headers.copy()
+    yield _session_client
+    _session_client.headers = headers
+
+
 @pytest.fixture
 def authenticated_client(test_client) -> TestClient:
     test_client.headers.update({"x-toolforge-tool": "test-tool-1"})
     return test_client
 
 
-@pytest.fixture
-def fake_toolforge_client(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+@pytest.fixture(scope="session")
+def unauthed_client(app: FastAPI) -> Generator[TestClient, None, None]:
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def _toolforge_client_slot() -> Generator[
+    dict[str, FakeToolforgeClient | None], None, None
+]:
+    # patched once for the whole session, each test only swaps the client in the slot
+    slot: dict[str, FakeToolforgeClient | None] = {"client": None}
     fake_kube_config = Kubeconfig(
         current_namespace="",
         current_server="",
     )
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            Kubeconfig, "load", lambda *args, **kwargs: fake_kube_config
+        )
+        monkeypatch.setattr(
+            components.runtime.toolforge, "get_toolforge_client", lambda: slot["client"]
+        )
+        yield slot
 
-    monkeypatch.setattr(Kubeconfig, "load", lambda *args, **kwargs: fake_kube_config)
-    fake_client = MagicMock(spec=ToolforgeClient)
 
-    monkeypatch.setattr(
-        components.runtime.toolforge, "get_toolforge_client", lambda: fake_client
-    )
+@pytest.fixture
+def fake_toolforge_client(
+    _toolforge_client_slot: dict[str, FakeToolforgeClient | None],
+) -> Generator[FakeToolforgeClient, None, None]:
+    fake_client = FakeToolforgeClient()
+    _toolforge_client_slot["client"] = fake_client
+    yield fake_client
+    _toolforge_client_slot["client"] = None
 
-    return fake_client
 
+@pytest.fixture
+def fake_toolforge_happy_path(
+    fake_toolforge_client: FakeToolforgeClient,
+) -> FakeToolforgeClient:
+    # every build gets started and succeeds right away, and every job gets created
+    fake_toolforge_client.post_return = {"new_build": {"name": "new-build-id"}}
+    fake_toolforge_client.get_return = {
+        "build": {
+            "status": BuildsBuildStatus.BUILD_SUCCESS.value,
+            "destination_image": "tool-test-tool-1/component1:latest",
+        }
+    }
+    fake_toolforge_client.patch_return = JOB_RESPONSE
+    return fake_toolforge_client
+
+
+def _get_fake_config_response() -> SimpleNamespace:
+    # only the bits of requests.Response that fetching a config uses
+    return SimpleNamespace(text=_FAKE_CONFIG_YAML, raise_for_status=lambda: None)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _block_network() -> Generator[None, None, None]:
+    # anything leaking past the fakes should fail right away instead of hanging on a connection
+    def _refuse_connection(*args, **kwargs):
+        raise RuntimeError("Tests are not allowed to open network connections")
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(socket.socket, "connect", _refuse_connection)
+        monkeypatch.setattr(socket.socket, "connect_ex", _refuse_connection)
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _block_requests() -> Generator[MagicMock, None, None]:
+    get_mock = MagicMock(return_value=_get_fake_config_response())
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(requests, "get", get_mock)
+        yield get_mock
 
-@pytest.fixture(autouse=True)
-def cleanup_deployments(app: FastAPI):
-    yield
-    client = TestClient(app)
-    client.headers.update({"x-toolforge-tool": "test-tool-1"})
-    response = client.get("/v1/tool/test-tool-1/deployment")
-    if response.status_code == status.HTTP_200_OK:
-        deployments = response.json()
-        for deployment in deployments["data"]["deployments"]:
-            client.delete(f"/v1/tool/test-tool-1/deployment/{deployment['deploy_id']}")
+
+@pytest.fixture
+def requests_get_mock(_block_requests: MagicMock) -> MagicMock:
+    _block_requests.reset_mock()
+    _block_requests.return_value = _get_fake_config_response()
+    return _block_requests
 
 
 @pytest.fixture(autouse=True)
@@ -77,8 +214,16 @@ def mock_time_sleep(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.undo()
 
 
+@pytest.fixture(scope="session")
+def _k8s_module_mock() -> MagicMock:
+    # speccing the whole kubernetes module is slow, so it's done once and reset for each test
+    return MagicMock(spec_set=kubernetes)
+
+
 @pytest.fixture
-def storage_k8s_cli(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
-    k8s_mock = MagicMock(spec=kubernetes)
-    monkeypatch.setattr("components.storage.kubernetes.kubernetes", k8s_mock)
-    return k8s_mock.client.CustomObjectsApi()
+def storage_k8s_cli(
+    monkeypatch: pytest.MonkeyPatch, _k8s_module_mock: MagicMock
+) -> MagicMock:
+    _k8s_module_mock.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr("components.storage.kubernetes.kubernetes", _k8s_module_mock)
+    return _k8s_module_mock.client.CustomObjectsApi()
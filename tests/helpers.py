@@ -11,10 +11,8 @@ from components.models.api_models import (
 )
 
 
-def get_fake_tool_config(
-    build: dict[str, Any] | None = None, **overrides
-) -> ToolConfig:
-    params = {
+def _get_fake_tool_config_params() -> dict[str, Any]:
+    return {
         "config_version": "v1beta1",
         "components": {
             "component1": {
@@ -36,6 +34,23 @@ def get_fake_tool_config(
             }
         },
     }
+
+
+_DEFAULT_FAKE_TOOL_CONFIG = ToolConfig.model_validate(_get_fake_tool_config_params())
+# body to send when posting the default fake config
+DEFAULT_FAKE_TOOL_CONFIG_JSON = _DEFAULT_FAKE_TOOL_CONFIG.model_dump_json(
+    exclude_unset=True
+)
+
+
+def get_fake_tool_config(
+    build: dict[str, Any] | None = None, **overrides
+) -> ToolConfig:
+    if build is None and not overrides:
+        # tests may modify the config, so hand out a copy
+        return _DEFAULT_FAKE_TOOL_CONFIG.model_copy(deep=True)
+
+    params = _get_fake_tool_config_params()
     params.update(overrides)
     if build is not None:
         params["components"]["component1"]["build"] = build
@@ -45,10 +60,8 @@ def get_fake_tool_config(
 def create_tool_config(
     client: TestClient, tool_name: str = "test-tool-1"
 ) -> ToolConfigResponse:
-    tool_config = get_fake_tool_config()
     response = client.post(
-        f"/v1/tool/{tool_name}/config",
-        content=tool_config.model_dump_json(exclude_unset=True),
+        f"/v1/tool/{tool_name}/config", content=DEFAULT_FAKE_TOOL_CONFIG_JSON
     )
     assert response.status_code == status.HTTP_200_OK
     return ToolConfigResponse.model_validate(response.json())
@@ -2,7 +2,6 @@ import datetime
 from unittest.mock import MagicMock
 
 import pytest
-from freezegun import freeze_time
 from pytest import MonkeyPatch
 
 from components.models.api_models import DeploymentState
@@ -34,7 +33,7 @@ class TestKubernetesStorage:
         }
 
         timeout_old_deployments_mock = MagicMock(
-            spec=KubernetesStorage._timeout_old_deployments
+            spec_set=KubernetesStorage._timeout_old_deployments
         )
         monkeypatch.setattr(
             "components.storage.kubernetes.KubernetesStorage._timeout_old_deployments",
@@ -69,7 +68,7 @@ class TestKubernetesStorage:
         }
 
         timeout_old_deployments_mock = MagicMock(
-            spec=KubernetesStorage._timeout_old_deployments
+            spec_set=KubernetesStorage._timeout_old_deployments
         )
         monkeypatch.setattr(
             "components.storage.kubernetes.KubernetesStorage._timeout_old_deployments",
@@ -98,7 +97,7 @@ class TestKubernetesStorage:
         }
 
         timeout_old_deployments_mock = MagicMock(
-            spec=KubernetesStorage._timeout_old_deployments
+            spec_set=KubernetesStorage._timeout_old_deployments
         )
         monkeypatch.setattr(
             "components.storage.kubernetes.KubernetesStorage._timeout_old_deployments",
@@ -119,9 +118,9 @@ class TestTimeoutOldDeployments:
         new_deployment = get_deployment_from_tool_config(
             tool_config=get_tool_config(), creation_time="20550602-000000"
         )
-        storage._list_deployments = MagicMock(spec=storage._list_deployments)
+        storage._list_deployments = MagicMock(spec_set=storage._list_deployments)
         storage._list_deployments.return_value = [old_deployment, new_deployment]
-        storage._update_deployment = MagicMock(spec=storage._update_deployment)
+        storage._update_deployment = MagicMock(spec_set=storage._update_deployment)
 
         storage._timeout_old_deployments(tool_name="my-tool")
 
@@ -139,14 +138,16 @@ class TestTimeoutOldDeployments:
             tool_config=get_tool_config(),
             creation_time=cur_date.strftime("%Y%m%d-%H%M%S"),
         )
-        storage._list_deployments = MagicMock(spec=storage._list_deployments)
+        storage._list_deployments = MagicMock(spec_set=storage._list_deployments)
         storage._list_deployments.return_value = [old_deployment]
-        storage._update_deployment = MagicMock(spec=storage._update_deployment)
+        storage._update_deployment = MagicMock(spec_set=storage._update_deployment)
 
-        with freeze_time(
-            cur_date + settings.deployment_timeout + datetime.timedelta(seconds=1)
-        ):
-            storage._timeout_old_deployments(tool_name="my-tool")
+        storage._timeout_old_deployments(
+            tool_name="my-tool",
+            now=lambda: (
+                cur_date + settings.deployment_timeout + datetime.timedelta(seconds=1)
+            ),
+        )
 
         storage._update_deployment.assert_called_once_with(
             deployment=old_deployment, tool_name="my-tool"
@@ -168,9 +169,9 @@ class TestTimeoutOldDeployments:
             with_deployment_state=deployment_state,
             creation_time="20210601-000000",
         )
-        storage._list_deployments = MagicMock(spec=storage._list_deployments)
+        storage._list_deployments = MagicMock(spec_set=storage._list_deployments)
         storage._list_deployments.return_value = [deployment_to_time_out]
-        storage._update_deployment = MagicMock(spec=storage._update_deployment)
+        storage._update_deployment = MagicMock(spec_set=storage._update_deployment)
 
         storage._timeout_old_deployments(tool_name="my-tool")
 
@@ -195,9 +196,9 @@ class TestTimeoutOldDeployments:
             with_deployment_state=deployment_state,
             creation_time="20210601-000000",
         )
-        storage._list_deployments = MagicMock(spec=storage._list_deployments)
+        storage._list_deployments = MagicMock(spec_set=storage._list_deployments)
         storage._list_deployments.return_value = [deployment_to_ignore]
-        storage._update_deployment = MagicMock(spec=storage._update_deployment)
+        storage._update_deployment = MagicMock(spec_set=storage._update_deployment)
 
         storage._timeout_old_deployments(tool_name="my-tool")
 
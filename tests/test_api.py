@@ -1,11 +1,10 @@
 import json
-from unittest.mock import ANY, MagicMock
+from unittest.mock import ANY, MagicMock, call
 from uuid import UUID
 
 import pytest
-import requests
 import yaml
-from fastapi import BackgroundTasks, FastAPI, status
+from fastapi import BackgroundTasks, status
 from fastapi.testclient import TestClient
 
 from components.gen.toolforge_models import (
@@ -13,7 +12,6 @@ from components.gen.toolforge_models import (
     BuildsBuildParameters,
     BuildsBuildStatus,
     JobsHttpHealthCheck,
-    JobsJobResponse,
     JobsScriptHealthCheck,
 )
 from components.main import create_app
@@ -28,39 +26,86 @@ from components.models.api_models import (
     DeploymentRunInfo,
     DeploymentRunState,
     DeploymentState,
-    DeployTokenResponse,
-    HealthState,
-    HealthzResponse,
     ResponseMessages,
     SourceBuildInfo,
     ToolConfig,
     ToolConfigResponse,
     ToolDeploymentResponse,
 )
-from components.runtime.utils import get_runtime
-from components.settings import Settings, get_settings
+from components.runtime.base import Runtime
+from components.settings import Settings
+from components.storage.base import Storage
 from components.storage.mock import MockStorage
 from components.storage.utils import get_storage
 from tests.helpers import (
+    DEFAULT_FAKE_TOOL_CONFIG_JSON,
     create_deploy_token,
     create_tool_config,
-    create_tool_deployment,
     delete_deploy_token,
     delete_tool_config,
     get_deploy_token,
     get_fake_tool_config,
 )
-from tests.testlibs import get_defined_job, get_tool_config
+from tests.testlibs import (
+    JOB_RESPONSE,
+    FakeToolforgeClient,
+    get_defined_job,
+    get_tool_config,
+)
+
+# job the runtime is expected to send for the default fake tool config
+_EXPECTED_DEPLOYMENT_PATCH = {
+    "job_type": "continuous",
+    "cmd": "some command",
+    "cpu": "0.5",
+    "filelog": False,
+    "health_check": {"path": "/health", "type": "http"},
+    "imagename": "tool-test-tool-1/component1:latest",
+    "memory": "256Mi",
+    "name": "component1",
+    "port": 8080,
+    "replicas": 2,
+    "mount": "none",
+}
+
+# the healthz response is fixed, so it's compared byte by byte
+_HEALTHZ_BODY = (
+    b'{"data":{"status":"OK"},'
+    b'"messages":{"info":[],"warning":["You are using a beta feature of Toolforge."],"error":[]}}'
+)
 
+# every endpoint that needs the tool to authenticate, with the method to call it
+AUTH_REQUIRED_ENDPOINTS = [
+    ("get", "/v1/tool/test-tool-1/config"),
+    ("post", "/v1/tool/test-tool-1/config"),
+    ("delete", "/v1/tool/test-tool-1/config"),
+    ("get", "/v1/tool/test-tool-1/config/generate"),
+    ("get", "/v1/tool/test-tool-1/deployment"),
+    ("post", "/v1/tool/test-tool-1/deployment"),
+    ("get", "/v1/tool/test-tool-1/deployment/latest"),
+    ("put", "/v1/tool/test-tool-1/deployment/latest/cancel"),
+    ("get", "/v1/tool/test-tool-1/deployment/some-id"),
+    ("delete", "/v1/tool/test-tool-1/deployment/some-id"),
+    ("put", "/v1/tool/test-tool-1/deployment/some-id/cancel"),
+    ("get", "/v1/tool/test-tool-1/deployment/token"),
+    ("post", "/v1/tool/test-tool-1/deployment/token"),
+    ("put", "/v1/tool/test-tool-1/deployment/token"),
+    ("delete", "/v1/tool/test-tool-1/deployment/token"),
+]
 
-def test_healthz_endpoint_returns_ok_status(test_client: TestClient):
-    expected_state = HealthState(status="OK")
 
+def test_healthz_endpoint_returns_ok_status(test_client: TestClient):
     raw_response = test_client.get("/v1/healthz")
 
     assert raw_response.status_code == status.HTTP_200_OK
-    gotten_state = HealthzResponse.model_validate(raw_response.json()).data
-    assert gotten_state == expected_state
+    assert raw_response.content == _HEALTHZ_BODY
+
+
+@pytest.mark.parametrize("method,url", AUTH_REQUIRED_ENDPOINTS)
+def test_requires_auth(test_client: TestClient, method: str, url: str):
+    raw_response = getattr(test_client, method)(url)
+
+    assert raw_response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
 class TestUpdateToolConfig:
@@ -73,8 +118,7 @@ class TestUpdateToolConfig:
 
         expected_tool_config = get_fake_tool_config()
         raw_response = authenticated_client.post(
-            "/v1/tool/test-tool-1/config",
-            content=expected_tool_config.model_dump_json(exclude_unset=True),
+            "/v1/tool/test-tool-1/config", content=DEFAULT_FAKE_TOOL_CONFIG_JSON
         )
 
         assert raw_response.status_code == status.HTTP_200_OK
@@ -84,21 +128,22 @@ class TestUpdateToolConfig:
 
     def test_succeeds_with_valid_config(self, authenticated_client: TestClient):
         expected_tool_config = get_fake_tool_config()
-        expected_messages = ResponseMessages(
+        expected_messages = ResponseMessages.model_construct(
             warning=["You are using a beta feature of Toolforge."],
             info=["Configuration for test-tool-1 updated successfully."],
         )
         raw_response = authenticated_client.post(
-            "/v1/tool/test-tool-1/config",
-            content=expected_tool_config.model_dump_json(exclude_unset=True),
+            "/v1/tool/test-tool-1/config", content=DEFAULT_FAKE_TOOL_CONFIG_JSON
         )
 
         assert raw_response.status_code == status.HTTP_200_OK
-        gotten_response = ToolConfigResponse.model_validate(raw_response.json())
-        assert gotten_response.data.model_dump(
-            exclude_unset=True
-        ) == expected_tool_config.model_dump(exclude_unset=True)
-        assert gotten_response.messages == expected_messages
+        gotten_response = raw_response.json()
+        assert gotten_response["data"] == expected_tool_config.model_dump(
+            mode="json", exclude_unset=True
+        )
+        assert gotten_response["messages"] == expected_messages.model_dump(
+            mode="json", exclude_unset=True
+        )
 
     def test_fails_with_invalid_config_data(
         self,
@@ -109,20 +154,11 @@ class TestUpdateToolConfig:
         )
         assert raw_response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-    def test_fails_without_auth_header(self, test_client: TestClient):
-        expected_tool_config = get_fake_tool_config()
-        raw_response = test_client.post(
-            "/v1/tool/test-tool-1/config",
-            content=expected_tool_config.model_dump_json(exclude_unset=True),
-        )
-
-        assert raw_response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_returns_warning_with_unknown_fields(
         self, authenticated_client: TestClient
     ):
         expected_tool_config = get_fake_tool_config()
-        expected_messages = ResponseMessages(
+        expected_messages = ResponseMessages.model_construct(
             warning=[
                 "You are using a beta feature of Toolforge.",
                 "Unknown field components.component1.internal_extra_field, skipped",
@@ -130,9 +166,7 @@ class TestUpdateToolConfig:
             ],
             info=["Configuration for test-tool-1 updated successfully."],
         )
-        sent_config = json.loads(
-            expected_tool_config.model_dump_json(exclude_unset=True)
-        )
+        sent_config = json.loads(DEFAULT_FAKE_TOOL_CONFIG_JSON)
         sent_config["extra_field_1"] = 1234
         sent_config["components"]["component1"]["internal_extra_field"] = 1234
         raw_response = authenticated_client.post(
@@ -140,20 +174,22 @@ class TestUpdateToolConfig:
         )
 
         assert raw_response.status_code == status.HTTP_200_OK
-        gotten_response = ToolConfigResponse.model_validate(raw_response.json())
-        assert gotten_response.data.model_dump(
-            exclude_unset=True
-        ) == expected_tool_config.model_dump(exclude_unset=True)
-        assert gotten_response.messages == expected_messages
+        gotten_response = raw_response.json()
+        assert gotten_response["data"] == expected_tool_config.model_dump(
+            mode="json", exclude_unset=True
+        )
+        assert gotten_response["messages"] == expected_messages.model_dump(
+            mode="json", exclude_unset=True
+        )
 
     def test_fetches_config_when_source_url_passed(
-        self, authenticated_client: TestClient, monkeypatch: pytest.MonkeyPatch
+        self, authenticated_client: TestClient, requests_get_mock: MagicMock
     ):
         expected_tool_config = get_fake_tool_config(
             source_url="http://idontexist.local/myconfig"
         )
 
-        expected_messages = ResponseMessages(
+        expected_messages = ResponseMessages.model_construct(
             warning=[
                 "You are using a beta feature of Toolforge.",
             ],
@@ -163,25 +199,23 @@ class TestUpdateToolConfig:
             expected_tool_config.model_dump_json(exclude_unset=True)
         )
 
-        response_mock = MagicMock()
-        response_mock.text = yaml.safe_dump(
+        requests_get_mock.return_value.text = yaml.safe_dump(
             json.loads(expected_tool_config.model_dump_json(exclude_unset=True))
         )
-        get_mock = MagicMock()
-        get_mock.return_value = response_mock
-        monkeypatch.setattr(requests, "get", get_mock)
 
         raw_response = authenticated_client.post(
             "/v1/tool/test-tool-1/config", json=sent_config_json
         )
 
         assert raw_response.status_code == status.HTTP_200_OK
-        gotten_response = ToolConfigResponse.model_validate(raw_response.json())
-        assert gotten_response.data.model_dump(
-            exclude_unset=True
-        ) == expected_tool_config.model_dump(exclude_unset=True)
-        assert gotten_response.messages == expected_messages
-        get_mock.assert_called_once()
+        gotten_response = raw_response.json()
+        assert gotten_response["data"] == expected_tool_config.model_dump(
+            mode="json", exclude_unset=True
+        )
+        assert gotten_response["messages"] == expected_messages.model_dump(
+            mode="json", exclude_unset=True
+        )
+        requests_get_mock.assert_called_once()
 
     def test_fails_with_missing_referenced_component(
         self, authenticated_client: TestClient
@@ -265,7 +299,7 @@ class TestGetToolConfig:
         BETA_WARNING_MESSAGE = "You are using a beta feature of Toolforge."
 
         expected_response = ToolConfigResponse(
-            messages=ResponseMessages(warning=[BETA_WARNING_MESSAGE]),
+            messages=ResponseMessages.model_construct(warning=[BETA_WARNING_MESSAGE]),
             data=ToolConfig.model_validate(
                 get_fake_tool_config().model_dump(exclude_unset=True)
             ),
@@ -282,11 +316,6 @@ class TestGetToolConfig:
 
 
 class TestCreateDeployment:
-    def test_fails_without_auth_header(self, test_client: TestClient):
-        raw_response = test_client.post("/v1/tool/test-tool-1/deployment")
-
-        assert raw_response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_fails_if_tool_has_no_config(self, authenticated_client: TestClient):
         raw_response = authenticated_client.get("/v1/tool/test-tool-1/config")
         assert raw_response.status_code == status.HTTP_404_NOT_FOUND
@@ -306,7 +335,7 @@ class TestCreateDeployment:
     def test_deployment_gets_saved_to_storage_with_valid_config(
         self,
         monkeypatch: pytest.MonkeyPatch,
-        fake_toolforge_client: MagicMock,
+        fake_toolforge_client: FakeToolforgeClient,
         storage_k8s_cli: MagicMock,
     ):
         my_settings = Settings(runtime_type="toolforge", storage_type="kubernetes")
@@ -339,16 +368,14 @@ class TestCreateDeployment:
             },
         }
 
-        fake_toolforge_client.post.return_value = {
-            "new_build": {"name": "new-build-id"}
-        }
-        fake_toolforge_client.get.return_value = {
+        fake_toolforge_client.post_return = {"new_build": {"name": "new-build-id"}}
+        fake_toolforge_client.get_return = {
             "build": {
                 "status": BuildsBuildStatus.BUILD_SUCCESS.value,
                 "destination_image": "tool-test-tool-1/component1:latest@sha256:abc123",
             }
         }
-        fake_toolforge_client.patch.return_value = JobsJobResponse().model_dump()
+        fake_toolforge_client.patch_return = JOB_RESPONSE
         tool_config = get_fake_tool_config()
         monkeypatch.setattr(
             k8s_storage, "get_tool_config", lambda *args, **kwargs: tool_config
@@ -359,7 +386,7 @@ class TestCreateDeployment:
         monkeypatch.setattr(
             k8s_storage,
             "update_deployment",
-            MagicMock(spec=k8s_storage.update_deployment),
+            MagicMock(spec_set=k8s_storage.update_deployment),
         )
 
         response = my_client.post("/v1/tool/test-tool-1/deployment")
@@ -374,19 +401,19 @@ class TestCreateDeployment:
         assert gotten_k8s_config == expected_k8s_config
 
     def test_creates_and_returns_the_new_deployment_of_source_built_component_using_header_auth(
-        self, authenticated_client: TestClient, fake_toolforge_client: MagicMock
+        self,
+        authenticated_client: TestClient,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
         create_tool_config(authenticated_client)
-        fake_toolforge_client.post.return_value = {
-            "new_build": {"name": "new-build-id"}
-        }
-        fake_toolforge_client.get.return_value = {
+        fake_toolforge_client.post_return = {"new_build": {"name": "new-build-id"}}
+        fake_toolforge_client.get_return = {
             "build": {
                 "status": BuildsBuildStatus.BUILD_SUCCESS.value,
                 "destination_image": "tool-test-tool-1/component1:latest@sha256:abc123",
             }
         }
-        fake_toolforge_client.patch.return_value = JobsJobResponse().model_dump()
+        fake_toolforge_client.patch_return = JOB_RESPONSE
 
         response = authenticated_client.post("/v1/tool/test-tool-1/deployment")
         assert response.status_code == status.HTTP_200_OK
@@ -422,46 +449,28 @@ class TestCreateDeployment:
             exclude_unset=True
         ) == gotten_deployment.data.model_dump(exclude_unset=True)
 
-        fake_toolforge_client.patch.assert_called_once_with(
-            "/jobs/v1/tool/test-tool-1/jobs/",
-            json={
-                "job_type": "continuous",
-                "cmd": "some command",
-                "cpu": "0.5",
-                "filelog": False,
-                "health_check": {"path": "/health", "type": "http"},
-                "imagename": "tool-test-tool-1/component1:latest@sha256:abc123",
-                "memory": "256Mi",
-                "name": "component1",
-                "port": 8080,
-                "replicas": 2,
-                "mount": "none",
-            },
-            verify=True,
-        )
+        assert fake_toolforge_client.patch_calls == [
+            call(
+                "/jobs/v1/tool/test-tool-1/jobs/",
+                json={
+                    **_EXPECTED_DEPLOYMENT_PATCH,
+                    "imagename": "tool-test-tool-1/component1:latest@sha256:abc123",
+                },
+                verify=True,
+            )
+        ]
 
     @pytest.mark.asyncio
+    @pytest.mark.usefixtures("fake_toolforge_happy_path")
     async def test_creates_and_returns_the_new_deployment_of_source_built_component_using_token(
         self,
         authenticated_client: TestClient,
-        fake_toolforge_client: MagicMock,
-        app: FastAPI,
+        fake_toolforge_client: FakeToolforgeClient,
+        unauthed_client: TestClient,
     ):
         create_tool_config(authenticated_client)
         token_response = create_deploy_token(authenticated_client)
         token = str(token_response.data.token)
-        fake_toolforge_client.post.return_value = {
-            "new_build": {"name": "new-build-id"}
-        }
-        fake_toolforge_client.get.return_value = {
-            "build": {
-                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                "destination_image": "tool-test-tool-1/component1:latest",
-            }
-        }
-        fake_toolforge_client.patch.return_value = JobsJobResponse().model_dump()
-        unauthed_client = TestClient(app)
-
         response = unauthed_client.post(
             f"/v1/tool/test-tool-1/deployment?token={token}"
         )
@@ -498,37 +507,20 @@ class TestCreateDeployment:
             exclude_unset=True
         ) == gotten_deployment.data.model_dump(exclude_unset=True)
 
-        fake_toolforge_client.patch.assert_called_once_with(
-            "/jobs/v1/tool/test-tool-1/jobs/",
-            json={
-                "job_type": "continuous",
-                "cmd": "some command",
-                "cpu": "0.5",
-                "filelog": False,
-                "health_check": {"path": "/health", "type": "http"},
-                "imagename": "tool-test-tool-1/component1:latest",
-                "memory": "256Mi",
-                "name": "component1",
-                "port": 8080,
-                "replicas": 2,
-                "mount": "none",
-            },
-            verify=True,
-        )
+        assert fake_toolforge_client.patch_calls == [
+            call(
+                "/jobs/v1/tool/test-tool-1/jobs/",
+                json=_EXPECTED_DEPLOYMENT_PATCH,
+                verify=True,
+            )
+        ]
 
+    @pytest.mark.usefixtures("fake_toolforge_happy_path")
     def test_creates_and_returns_the_new_deployment_of_source_build_job(
-        self, authenticated_client: TestClient, fake_toolforge_client: MagicMock
+        self,
+        authenticated_client: TestClient,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        fake_toolforge_client.post.return_value = {
-            "new_build": {"name": "new-build-id"}
-        }
-        fake_toolforge_client.get.return_value = {
-            "build": {
-                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                "destination_image": "tool-test-tool-1/component1:latest",
-            }
-        }
-        fake_toolforge_client.patch.return_value = JobsJobResponse().model_dump()
         my_tool_config = get_fake_tool_config(
             build={
                 "repository": "https://gitlab-example.wikimedia.org/some-repo.git",
@@ -539,10 +531,10 @@ class TestCreateDeployment:
             "/v1/tool/test-tool-1/config",
             content=my_tool_config.model_dump_json(exclude_unset=True),
         )
-        response.raise_for_status()
+        assert response.status_code == status.HTTP_200_OK
 
         response = authenticated_client.post("/v1/tool/test-tool-1/deployment")
-        response.raise_for_status()
+        assert response.status_code == status.HTTP_200_OK
 
         expected_deployment = ToolDeploymentResponse.model_validate(response.json())
         expected_deployment.data.status = DeploymentState.successful
@@ -575,35 +567,23 @@ class TestCreateDeployment:
             exclude_unset=True
         ) == gotten_deployment.data.model_dump(exclude_unset=True)
 
-        fake_toolforge_client.patch.assert_called_once_with(
-            "/jobs/v1/tool/test-tool-1/jobs/",
-            json={
-                "job_type": "continuous",
-                "cmd": "some command",
-                "cpu": "0.5",
-                "filelog": False,
-                "health_check": {"path": "/health", "type": "http"},
-                "imagename": "tool-test-tool-1/component1:latest",
-                "memory": "256Mi",
-                "name": "component1",
-                "port": 8080,
-                "replicas": 2,
-                "mount": "none",
-            },
-            verify=True,
-        )
+        assert fake_toolforge_client.patch_calls == [
+            call(
+                "/jobs/v1/tool/test-tool-1/jobs/",
+                json=_EXPECTED_DEPLOYMENT_PATCH,
+                verify=True,
+            )
+        ]
 
     def test_returns_denied_for_bad_token(
         self,
         authenticated_client: TestClient,
-        app: FastAPI,
+        unauthed_client: TestClient,
     ):
         create_tool_config(authenticated_client)
         token_response = create_deploy_token(authenticated_client)
         token = str(token_response.data.token)
 
-        unauthed_client = TestClient(app)
-
         response = unauthed_client.post(
             f"/v1/tool/test-tool-1/deployment?token={token}withextrastuff"
         )
@@ -612,14 +592,12 @@ class TestCreateDeployment:
     def test_returns_conflict_when_trying_to_run_many_deployments_in_parallel(
         self,
         authenticated_client: TestClient,
-        fake_toolforge_client: MagicMock,
+        fake_toolforge_client: FakeToolforgeClient,
         monkeypatch: pytest.MonkeyPatch,
+        settings: Settings,
     ):
-        settings = get_settings()
-        fake_toolforge_client.post.return_value = {
-            "new_build": {"name": "new-build-id"}
-        }
-        fake_toolforge_client.get.return_value = {"build": {"status": "BUILD_RUNNING"}}
+        fake_toolforge_client.post_return = {"new_build": {"name": "new-build-id"}}
+        fake_toolforge_client.get_return = {"build": {"status": "BUILD_RUNNING"}}
         my_tool_config = get_fake_tool_config(
             build={
                 "repository": "https://gitlab-example.wikimedia.org/some-repo.git",
@@ -633,32 +611,23 @@ class TestCreateDeployment:
         # as the deployment will never be ending, and during tests there's no real background tasks, we mock it so it
         # returns keeping the deployment pending
         monkeypatch.setattr(BackgroundTasks, "add_task", MagicMock())
-        response.raise_for_status()
+        assert response.status_code == status.HTTP_200_OK
         for _ in range(settings.max_parallel_deployments):
             response = authenticated_client.post("/v1/tool/test-tool-1/deployment")
-            response.raise_for_status()
+            assert response.status_code == status.HTTP_200_OK
 
         # one more should break
         response = authenticated_client.post("/v1/tool/test-tool-1/deployment")
 
         assert response.status_code == status.HTTP_409_CONFLICT
 
+    @pytest.mark.usefixtures("fake_toolforge_happy_path")
     def test_fetches_config_when_source_url_passed(
         self,
         authenticated_client: TestClient,
-        monkeypatch: pytest.MonkeyPatch,
-        fake_toolforge_client: MagicMock,
+        requests_get_mock: MagicMock,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        fake_toolforge_client.post.return_value = {
-            "new_build": {"name": "new-build-id"}
-        }
-        fake_toolforge_client.get.return_value = {
-            "build": {
-                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                "destination_image": "tool-test-tool-1/component1:latest",
-            }
-        }
-        fake_toolforge_client.patch.return_value = JobsJobResponse().model_dump()
         my_tool_config = get_fake_tool_config(
             source_url="http://idontexist.local/myconfig",
             build={
@@ -666,25 +635,21 @@ class TestCreateDeployment:
                 "ref": "some_ref",
             },
         )
-        response_mock = MagicMock()
-        response_mock.text = yaml.safe_dump(
+        requests_get_mock.return_value.text = yaml.safe_dump(
             json.loads(my_tool_config.model_dump_json(exclude_unset=True))
         )
-        get_mock = MagicMock()
-        get_mock.return_value = response_mock
-        monkeypatch.setattr(requests, "get", get_mock)
         response = authenticated_client.post(
             "/v1/tool/test-tool-1/config",
             content=my_tool_config.model_dump_json(exclude_unset=True),
         )
-        response.raise_for_status()
-        get_mock.assert_called_once()
-        get_mock.reset_mock()
+        assert response.status_code == status.HTTP_200_OK
+        requests_get_mock.assert_called_once()
+        requests_get_mock.reset_mock()
 
         response = authenticated_client.post("/v1/tool/test-tool-1/deployment")
-        response.raise_for_status()
+        assert response.status_code == status.HTTP_200_OK
 
-        get_mock.assert_called_once()
+        requests_get_mock.assert_called_once()
 
 
 class TestDeleteDeployment:
@@ -698,10 +663,8 @@ class TestDeleteDeployment:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_returns_not_found_when_the_deployment_does_not_exist(
-        self, authenticated_client: TestClient
+        self, authenticated_client: TestClient, seeded_tool: ToolConfig
     ):
-        create_tool_config(authenticated_client)
-
         response = authenticated_client.delete(
             "/v1/tool/test-tool-1/deployment/idontexist"
         )
@@ -709,13 +672,10 @@ class TestDeleteDeployment:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_deletes_the_deployment_when_it_exists(
-        self, authenticated_client: TestClient, fake_toolforge_client: MagicMock
+        self, authenticated_client: TestClient, seeded_deployment: Deployment
     ):
-        create_tool_config(authenticated_client)
-        deployment_response = create_tool_deployment(authenticated_client)
-
         delete_response = authenticated_client.delete(
-            f"/v1/tool/test-tool-1/deployment/{deployment_response.data.deploy_id}"
+            f"/v1/tool/test-tool-1/deployment/{seeded_deployment.deploy_id}"
         )
         assert delete_response.status_code == status.HTTP_200_OK
 
@@ -744,20 +704,17 @@ class TestDeleteToolConfig:
         response = authenticated_client.delete("/v1/tool/test-tool-1/config")
 
         assert response.status_code == status.HTTP_200_OK
-        gotten_response = ToolConfigResponse.model_validate(response.json())
-        assert gotten_response.data == my_tool_config.data
-        assert gotten_response.messages != []
+        gotten_response = response.json()
+        assert gotten_response["data"] == my_tool_config.data.model_dump(
+            mode="json", exclude_unset=True
+        )
+        assert gotten_response["messages"] != []
 
         response = authenticated_client.get("/v1/tool/test-tool-1/config")
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
 class TestGetDeployToken:
-    def test_fails_without_auth_header(self, test_client: TestClient):
-        raw_response = test_client.get("/v1/tool/test-tool-1/deployment/token")
-
-        assert raw_response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_returns_not_found_when_token_does_not_exist(
         self, authenticated_client: TestClient
     ):
@@ -777,10 +734,6 @@ class TestGetDeployToken:
 
 
 class TestCreateDeployToken:
-    def test_fails_without_auth_header(self, test_client: TestClient):
-        raw_response = test_client.post("/v1/tool/test-tool-1/deployment/token")
-        assert raw_response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_fails_when_token_already_exists(self, authenticated_client: TestClient):
         create_deploy_token(authenticated_client)
         second_response = authenticated_client.post(
@@ -812,10 +765,6 @@ class TestCreateDeployToken:
 
 
 class TestUpdateDeployToken:
-    def test_fails_without_auth_header(self, test_client: TestClient):
-        raw_response = test_client.put("/v1/tool/test-tool-1/deployment/token")
-        assert raw_response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_fails_when_no_token_exists(self, authenticated_client: TestClient):
         delete_deploy_token(authenticated_client)
         raw_response = authenticated_client.put("/v1/tool/test-tool-1/deployment/token")
@@ -827,23 +776,17 @@ class TestUpdateDeployToken:
             "/v1/tool/test-tool-1/deployment/token"
         )
         assert update_response.status_code == status.HTTP_200_OK
-        update_data = DeployTokenResponse.model_validate(update_response.json())
+        update_data = update_response.json()["data"]
 
-        assert isinstance(update_data.data.token, UUID)
-        assert update_data.data.token != original_token.data.token
+        assert UUID(update_data["token"]) != original_token.data.token
 
         get_data = get_deploy_token(authenticated_client)
-        assert get_data.data.token == update_data.data.token
+        assert get_data.data.model_dump(mode="json") == update_data
 
         delete_deploy_token(authenticated_client)
 
 
 class TestDeleteDeployToken:
-    def test_fails_without_auth_header(self, test_client: TestClient):
-        raw_response = test_client.delete("/v1/tool/test-tool-1/deployment/token")
-
-        assert raw_response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_returns_not_found_when_tool_does_not_exist(
         self, authenticated_client: TestClient
     ):
@@ -856,10 +799,8 @@ class TestDeleteDeployToken:
     def test_returns_not_found_when_token_does_not_exist(
         self, authenticated_client: TestClient
     ):
-        expected_tool_config = get_fake_tool_config()
         raw_response = authenticated_client.post(
-            "/v1/tool/test-tool-1/config",
-            content=expected_tool_config.model_dump_json(exclude_unset=True),
+            "/v1/tool/test-tool-1/config", content=DEFAULT_FAKE_TOOL_CONFIG_JSON
         )
 
         assert raw_response.status_code == status.HTTP_200_OK
@@ -870,14 +811,13 @@ class TestDeleteDeployToken:
 
     def test_deletes_the_token_when_it_exists(self, authenticated_client: TestClient):
         create_response = create_deploy_token(authenticated_client)
-        creation_data = DeployTokenResponse.model_validate(create_response)
 
         delete_response = authenticated_client.delete(
             "/v1/tool/test-tool-1/deployment/token"
         )
         assert delete_response.status_code == status.HTTP_200_OK
-        deletion_data = DeployTokenResponse.model_validate(delete_response.json())
-        assert deletion_data.data.token == creation_data.data.token
+        deletion_data = delete_response.json()["data"]
+        assert deletion_data == create_response.data.model_dump(mode="json")
 
         get_response = authenticated_client.get("/v1/tool/test-tool-1/deployment/token")
         assert get_response.status_code == status.HTTP_404_NOT_FOUND
@@ -891,47 +831,37 @@ class TestListDeployments:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_returns_not_found_when_tool_exists_but_has_no_deployments(
-        self, authenticated_client: TestClient
+        self, authenticated_client: TestClient, seeded_tool: ToolConfig
     ):
-        create_tool_config(authenticated_client)
-
         response = authenticated_client.get("/v1/tool/test-tool-1/deployment")
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    @pytest.mark.usefixtures("fake_toolforge_happy_path")
     def test_returns_single_deployment_when_one_exists(
-        self, authenticated_client: TestClient, fake_toolforge_client: MagicMock
+        self,
+        authenticated_client: TestClient,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
         create_tool_config(authenticated_client)
-        fake_toolforge_client.post.return_value = {
-            "new_build": {"name": "new-build-id"}
-        }
-        fake_toolforge_client.get.return_value = {
-            "build": {
-                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                "destination_image": "tool-test-tool-1/component1:latest",
-            }
-        }
-        fake_toolforge_client.patch.return_value = JobsJobResponse().model_dump()
-        deployment_response = create_tool_deployment(authenticated_client)
-        expected_deployment = deployment_response.data
-        expected_deployment.status = DeploymentState.successful
-        expected_deployment.long_status = ANY
-        expected_deployment.builds[
-            "component1"
-        ].build_status = DeploymentBuildState.successful
-        expected_deployment.builds["component1"].build_id = "new-build-id"
-        expected_deployment.builds[
-            "component1"
-        ].build_image = "tool-test-tool-1/component1:latest"
-        expected_deployment.builds[
-            "component1"
-        ].build_long_status = (
-            "You can see the logs with `toolforge build logs new-build-id`"
+        deployment_response = authenticated_client.post(
+            "/v1/tool/test-tool-1/deployment"
+        )
+        assert deployment_response.status_code == status.HTTP_200_OK
+        expected_deployment = deployment_response.json()["data"]
+        expected_deployment["status"] = DeploymentState.successful.value
+        expected_deployment["long_status"] = ANY
+        expected_deployment["builds"]["component1"].update(
+            build_status=DeploymentBuildState.successful.value,
+            build_id="new-build-id",
+            build_image="tool-test-tool-1/component1:latest",
+            build_long_status=(
+                "You can see the logs with `toolforge build logs new-build-id`"
+            ),
+        )
+        expected_deployment["runs"]["component1"].update(
+            run_status=DeploymentRunState.successful.value,
+            run_long_status=ANY,
         )
-        expected_deployment.runs[
-            "component1"
-        ].run_status = DeploymentRunState.successful
-        expected_deployment.runs["component1"].run_long_status = ANY
 
         response = authenticated_client.get("/v1/tool/test-tool-1/deployment")
         assert response.status_code == status.HTTP_200_OK
@@ -939,18 +869,21 @@ class TestListDeployments:
         gotten_deployments = response.json()
         assert "data" in gotten_deployments
         assert "deployments" in gotten_deployments["data"]
-        assert len(gotten_deployments["data"]["deployments"]) == 1
-        assert (
-            Deployment.model_validate(gotten_deployments["data"]["deployments"][0])
-            == expected_deployment
-        )
+        assert gotten_deployments["data"]["deployments"] == [expected_deployment]
 
     def test_returns_multiple_deployments_when_they_exist(
-        self, authenticated_client: TestClient, fake_toolforge_client: MagicMock
+        self,
+        authenticated_client: TestClient,
+        storage: Storage,
+        seeded_deployment: Deployment,
     ):
-        create_tool_config(authenticated_client)
-        first_deployment = create_tool_deployment(authenticated_client)
-        second_deployment = create_tool_deployment(authenticated_client)
+        second_deployment = seeded_deployment.model_copy(
+            update={
+                "deploy_id": "20210602-000000-seeded",
+                "creation_time": "20210602-000000",
+            }
+        )
+        storage.create_deployment(tool_name="test-tool-1", deployment=second_deployment)
 
         response = authenticated_client.get("/v1/tool/test-tool-1/deployment")
         assert response.status_code == status.HTTP_200_OK
@@ -963,47 +896,46 @@ class TestListDeployments:
             dep["deploy_id"] for dep in deployments["data"]["deployments"]
         }
         assert deployment_ids == {
-            first_deployment.data.deploy_id,
-            second_deployment.data.deploy_id,
+            seeded_deployment.deploy_id,
+            second_deployment.deploy_id,
         }
 
     def test_returns_one_deployment_when_there_are_multiple_deployments(
-        self, authenticated_client: TestClient, fake_toolforge_client: MagicMock
+        self,
+        authenticated_client: TestClient,
+        storage: Storage,
+        seeded_deployment: Deployment,
     ):
-        create_tool_config(authenticated_client)
-        first_deployment = create_tool_deployment(authenticated_client)
         response = authenticated_client.get("/v1/tool/test-tool-1/deployment/latest")
         assert response.status_code == status.HTTP_200_OK
 
         latest_deployment = response.json()
         assert "data" in latest_deployment
-        assert latest_deployment["data"]["deploy_id"] == first_deployment.data.deploy_id
+        assert latest_deployment["data"]["deploy_id"] == seeded_deployment.deploy_id
 
-        second_deployment = create_tool_deployment(authenticated_client)
+        second_deployment = seeded_deployment.model_copy(
+            update={
+                "deploy_id": "20210602-000000-seeded",
+                "creation_time": "20210602-000000",
+            }
+        )
+        storage.create_deployment(tool_name="test-tool-1", deployment=second_deployment)
 
         response = authenticated_client.get("/v1/tool/test-tool-1/deployment/latest")
         assert response.status_code == status.HTTP_200_OK
 
         latest_deployment = response.json()
         assert "data" in latest_deployment
-        assert (
-            latest_deployment["data"]["deploy_id"] == second_deployment.data.deploy_id
-        )
+        assert latest_deployment["data"]["deploy_id"] == second_deployment.deploy_id
 
 
 class TestBuildComponents:
+    @pytest.mark.usefixtures("fake_toolforge_happy_path")
     def test_builds_one_component_when_its_source_build(
-        self, authenticated_client: TestClient, fake_toolforge_client: MagicMock
+        self,
+        authenticated_client: TestClient,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        fake_toolforge_client.post.return_value = {
-            "new_build": {"name": "new-build-id"}
-        }
-        fake_toolforge_client.get.return_value = {
-            "build": {
-                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                "destination_image": "tool-test-tool-1/component1:latest",
-            }
-        }
         my_tool_config = get_fake_tool_config(
             build={
                 "repository": "https://gitlab-example.wikimedia.org/some-repo.git",
@@ -1014,109 +946,113 @@ class TestBuildComponents:
             "/v1/tool/test-tool-1/config",
             content=my_tool_config.model_dump_json(exclude_unset=True),
         )
-        response.raise_for_status()
+        assert response.status_code == status.HTTP_200_OK
 
-        fake_toolforge_client.patch.return_value = JobsJobResponse().model_dump()
         response = authenticated_client.post("/v1/tool/test-tool-1/deployment")
-        response.raise_for_status()
+        assert response.status_code == status.HTTP_200_OK
 
-        expected_deployment = ToolDeploymentResponse.model_validate(response.json())
-        expected_deployment.data.status = DeploymentState.successful
-        expected_deployment.data.long_status = ANY
-        expected_deployment.data.builds[
-            "component1"
-        ].build_status = DeploymentBuildState.successful
-        expected_deployment.data.builds["component1"].build_id = "new-build-id"
-        expected_deployment.data.builds[
-            "component1"
-        ].build_image = "tool-test-tool-1/component1:latest"
-        expected_deployment.data.builds[
-            "component1"
-        ].build_long_status = (
-            "You can see the logs with `toolforge build logs new-build-id`"
+        expected_deployment = response.json()["data"]
+        expected_deployment["status"] = DeploymentState.successful.value
+        expected_deployment["long_status"] = ANY
+        expected_deployment["builds"]["component1"].update(
+            build_status=DeploymentBuildState.successful.value,
+            build_id="new-build-id",
+            build_image="tool-test-tool-1/component1:latest",
+            build_long_status=(
+                "You can see the logs with `toolforge build logs new-build-id`"
+            ),
+        )
+        expected_deployment["runs"]["component1"].update(
+            run_status=DeploymentRunState.successful.value,
+            run_long_status=ANY,
         )
-        expected_deployment.data.runs[
-            "component1"
-        ].run_status = DeploymentRunState.successful
-        expected_deployment.data.runs["component1"].run_long_status = ANY
 
         response = authenticated_client.get(
-            f"/v1/tool/test-tool-1/deployment/{expected_deployment.data.deploy_id}"
+            f"/v1/tool/test-tool-1/deployment/{expected_deployment['deploy_id']}"
         )
 
         assert response.status_code == status.HTTP_200_OK
-        gotten_deployment = ToolDeploymentResponse.model_validate(response.json())
         # we kinda ignore the messages
-        assert expected_deployment.data == gotten_deployment.data
-
-        fake_toolforge_client.patch.assert_called_once_with(
-            "/jobs/v1/tool/test-tool-1/jobs/",
-            json={
-                "job_type": "continuous",
-                "cmd": "some command",
-                "cpu": "0.5",
-                "filelog": False,
-                "health_check": {"path": "/health", "type": "http"},
-                "imagename": "tool-test-tool-1/component1:latest",
-                "memory": "256Mi",
-                "name": "component1",
-                "port": 8080,
-                "replicas": 2,
-                "mount": "none",
-            },
-            verify=True,
-        )
+        assert response.json()["data"] == expected_deployment
+
+        assert fake_toolforge_client.patch_calls == [
+            call(
+                "/jobs/v1/tool/test-tool-1/jobs/",
+                json=_EXPECTED_DEPLOYMENT_PATCH,
+                verify=True,
+            )
+        ]
+
+
+# generating a config only reads these, so they are shared by all the tests
+_TWO_CONTINUOUS_JOBS = [
+    get_defined_job(
+        name="job1",
+        health_check=JobsScriptHealthCheck(
+            script="test -e /tmp/everything_ok", type="script"
+        ),
+        image="job1-image",
+    ),
+    get_defined_job(
+        name="job2",
+        health_check=JobsHttpHealthCheck(path="/healthz", type="http"),
+        port=1234,
+        port_protocol="tcp",
+        image="job2-image",
+    ),
+]
+_TWO_CONTINUOUS_JOBS_BUILDS = [
+    BuildsBuild(
+        destination_image=_TWO_CONTINUOUS_JOBS[0].image,
+        parameters=BuildsBuildParameters(
+            source_url="https://some.source/url",
+            ref="some-ref",
+            # this has to be the same name as the job name
+            image_name="job1",
+        ),
+    ),
+    BuildsBuild(
+        destination_image=_TWO_CONTINUOUS_JOBS[1].image,
+        parameters=BuildsBuildParameters(
+            source_url="https://some.source/url",
+            # this has to be the same name as the job name
+            image_name="job2",
+        ),
+    ),
+]
+_UNSUPPORTED_JOBS = [
+    get_defined_job(
+        name="job1",
+        image="i-have-no-matching-build",
+    ),
+    get_defined_job(
+        name="job2",
+        continuous=False,
+    ),
+]
 
 
 class TestGenerateConfig:
     def test_generates_for_two_continuous_jobs(
-        self, authenticated_client: TestClient, monkeypatch: pytest.MonkeyPatch
+        self,
+        authenticated_client: TestClient,
+        monkeypatch: pytest.MonkeyPatch,
+        runtime: Runtime,
     ):
-        runtime = get_runtime(settings=get_settings())
-        jobs = [
-            get_defined_job(
-                name="job1",
-                health_check=JobsScriptHealthCheck(
-                    script="test -e /tmp/everything_ok", type="script"
-                ),
-                image="job1-image",
-            ),
-            get_defined_job(
-                name="job2",
-                health_check=JobsHttpHealthCheck(path="/healthz", type="http"),
-                port=1234,
-                port_protocol="tcp",
-                image="job2-image",
-            ),
-        ]
         monkeypatch.setattr(
-            target=runtime, name="get_jobs", value=lambda *args, **kwargs: jobs
-        )
-        builds = [
-            BuildsBuild(
-                destination_image=jobs[0].image,
-                parameters=BuildsBuildParameters(
-                    source_url="https://some.source/url",
-                    ref="some-ref",
-                    # this has to be the same name as the job name
-                    image_name="job1",
-                ),
-            ),
-            BuildsBuild(
-                destination_image=jobs[1].image,
-                parameters=BuildsBuildParameters(
-                    source_url="https://some.source/url",
-                    # this has to be the same name as the job name
-                    image_name="job2",
-                ),
-            ),
-        ]
+            target=runtime,
+            name="get_jobs",
+            value=lambda *args, **kwargs: _TWO_CONTINUOUS_JOBS,
+        )
         monkeypatch.setattr(
-            target=runtime, name="get_builds", value=lambda *args, **kwargs: builds
+            target=runtime,
+            name="get_builds",
+            value=lambda *args, **kwargs: _TWO_CONTINUOUS_JOBS_BUILDS,
         )
 
         expected_config = ToolConfigResponse(
             data=ToolConfig(
+                config_version="v1beta1",
                 components={
                     "job1": ContinuousComponentInfo(
                         build=SourceBuildInfo(
@@ -1124,55 +1060,45 @@ class TestGenerateConfig:
                             ref="some-ref",
                         ),
                         run=ContinuousRunInfo(
-                            command=jobs[0].cmd,
+                            command=_TWO_CONTINUOUS_JOBS[0].cmd,
                             health_check_script="test -e /tmp/everything_ok",
                         ),
                     ),
                     "job2": ContinuousComponentInfo(
-                        component_type="continuous",
                         build=SourceBuildInfo(
                             repository=AnyGitUrl("https://some.source/url"), ref="HEAD"
                         ),
                         run=ContinuousRunInfo(
-                            command=jobs[0].cmd,
+                            command=_TWO_CONTINUOUS_JOBS[0].cmd,
                             health_check_http="/healthz",
                             port=1234,
                             port_protocol="tcp",
                         ),
                     ),
-                }
+                },
             ),
             messages=ResponseMessages(
-                info=[],
                 warning=[
                     "Note that this config is an autogenerated example, please double check and validate before using it"
                 ],
-                error=[],
             ),
         )
 
         raw_response = authenticated_client.get("/v1/tool/test-tool-1/config/generate")
-        parsed_response = ToolConfigResponse.model_validate(raw_response.json())
-
-        assert parsed_response.data == expected_config.data
-        assert parsed_response.messages == expected_config.messages
+        assert raw_response.json() == expected_config.model_dump(
+            mode="json", exclude_unset=True
+        )
 
     def test_generates_example_if_no_supported_jobs(
-        self, authenticated_client: TestClient, monkeypatch: pytest.MonkeyPatch
+        self,
+        authenticated_client: TestClient,
+        monkeypatch: pytest.MonkeyPatch,
+        runtime: Runtime,
     ):
-        runtime = get_runtime(settings=get_settings())
-        jobs = [
-            get_defined_job(
-                name="job1",
-                image="i-have-no-matching-build",
-            ),
-            get_defined_job(
-                name="job2",
-                continuous=False,
-            ),
-        ]
         monkeypatch.setattr(
-            target=runtime, name="get_jobs", value=lambda *args, **kwargs: jobs
+            target=runtime,
+            name="get_jobs",
+            value=lambda *args, **kwargs: _UNSUPPORTED_JOBS,
         )
         monkeypatch.setattr(
             target=runtime, name="get_builds", value=lambda *args, **kwargs: []
@@ -1181,34 +1107,46 @@ class TestGenerateConfig:
         expected_config = ToolConfigResponse(
             data=EXAMPLE_GENERATED_CONFIG,
             messages=ResponseMessages(
-                info=[],
                 warning=[
                     "Note that this config is an autogenerated example, please double check and validate before using it",
                     "Job job1 seems not to be a build-service based job (or no build found for it), skipping",
                     "Job job2 seems not to be a build-service based job (or no build found for it), skipping",
                     "No components were able to be generated from your tool, a sample set of them is returned instead",
                 ],
-                error=[],
             ),
         )
 
         raw_response = authenticated_client.get("/v1/tool/test-tool-1/config/generate")
-        parsed_response = ToolConfigResponse.model_validate(raw_response.json())
-
-        assert parsed_response.data == expected_config.data
-        assert parsed_response.messages == expected_config.messages
+        assert raw_response.json() == expected_config.model_dump(
+            mode="json", exclude_unset=True
+        )
+
+
+def _cancellable_deployment(deployment_status: DeploymentState) -> Deployment:
+    return Deployment(
+        deploy_id="my-deploy-id",
+        creation_time="2021-06-01T00:00:00",
+        builds={
+            "my-component": DeploymentBuildInfo(
+                build_id="my-build",
+                build_status=DeploymentBuildState.pending,
+            )
+        },
+        runs={
+            "my-component": DeploymentRunInfo(
+                run_status=DeploymentRunState.pending,
+                run_long_status="",
+            )
+        },
+        tool_config=get_tool_config(),
+        status=deployment_status,
+        long_status="",
+    )
 
 
 class TestCancelDeployment:
-    def test_fails_without_auth_header(self, test_client: TestClient):
-        raw_response = test_client.put("/v1/tool/test-tool-1/deployment/some-id/cancel")
-
-        assert raw_response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_fails_if_tool_has_no_config(self, authenticated_client: TestClient):
         authenticated_client.delete("/v1/tool/test-tool-1/config")
-        raw_response = authenticated_client.get("/v1/tool/test-tool-1/config")
-        assert raw_response.status_code == status.HTTP_404_NOT_FOUND
 
         raw_response = authenticated_client.put(
             "/v1/tool/test-tool-1/deployment/some-id/cancel"
@@ -1230,34 +1168,17 @@ class TestCancelDeployment:
         "deployment_status", [DeploymentState.pending, DeploymentState.running]
     )
     def test_flags_deployment_for_cancellation(
-        self, authenticated_client: TestClient, deployment_status: DeploymentState
+        self,
+        authenticated_client: TestClient,
+        seeded_tool: ToolConfig,
+        deployment_status: DeploymentState,
     ):
-        create_tool_config(authenticated_client)
-
         # this breaks a bit the barrier between api tests only testing through the api, but found no nicer way to
         # test this as we have to catch the deployment "on the fly"
         storage = get_storage()
         storage.create_deployment(
             tool_name="test-tool-1",
-            deployment=Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.pending,
-                    )
-                },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.pending,
-                        run_long_status="",
-                    )
-                },
-                tool_config=get_tool_config(),
-                status=deployment_status,
-                long_status="",
-            ),
+            deployment=_cancellable_deployment(deployment_status=deployment_status),
         )
 
         response = authenticated_client.put(
@@ -1265,8 +1186,7 @@ class TestCancelDeployment:
         )
         assert response.status_code == status.HTTP_200_OK
 
-        expected_deployment = ToolDeploymentResponse.model_validate(response.json())
-        expected_deployment.data.status = DeploymentState.cancelling
+        assert response.json()["data"]["status"] == DeploymentState.cancelling.value
 
     @pytest.mark.parametrize(
         "deployment_status",
@@ -1279,34 +1199,17 @@ class TestCancelDeployment:
         ],
     )
     def test_returns_conflict_if_deployment_not_running(
-        self, authenticated_client: TestClient, deployment_status: DeploymentState
+        self,
+        authenticated_client: TestClient,
+        seeded_tool: ToolConfig,
+        deployment_status: DeploymentState,
     ):
-        create_tool_config(authenticated_client)
-
         # this breaks a bit the barrier between api tests only testing through the api, but found no nicer way to
         # test this as we have to catch the deployment "on the fly"
         storage = get_storage()
         storage.create_deployment(
             tool_name="test-tool-1",
-            deployment=Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.pending,
-                    )
-                },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.pending,
-                        run_long_status="",
-                    )
-                },
-                tool_config=get_tool_config(),
-                status=deployment_status,
-                long_status="",
-            ),
+            deployment=_cancellable_deployment(deployment_status=deployment_status),
         )
 
         response = authenticated_client.put(
@@ -1,19 +1,18 @@
 import datetime
-from unittest.mock import MagicMock, call
+from dataclasses import dataclass
+from typing import Any
+from unittest.mock import call
 
 import pytest
 import requests
 from fastapi import status
-from freezegun import freeze_time
 from pytest import MonkeyPatch
 from requests import ReadTimeout
-from toolforge_weld.api_client import ToolforgeClient
 
 from components.deploy_task import _retry_http_failures, do_deploy
 from components.gen.toolforge_models import (
     BuildsBuildStatus,
     JobsJobListResponse,
-    JobsJobResponse,
     JobsResponseMessages,
     JobsUpdateResponse,
 )
@@ -23,113 +22,413 @@ from components.models.api_models import (
     Deployment,
     DeploymentBuildInfo,
     DeploymentBuildState,
-    DeploymentRunInfo,
     DeploymentRunState,
     DeploymentState,
     SourceBuildInfo,
     SourceBuildReference,
     ToolConfig,
 )
-from components.runtime.utils import get_runtime
-from components.settings import get_settings
-from components.storage.mock import MockStorage
+from components.runtime.base import Runtime
+from components.storage.base import Storage
+
+from .testlibs import (
+    JOB_RESPONSE,
+    FakeClock,
+    FakeToolforgeClient,
+    assert_deployments_equal,
+    get_defined_job,
+    get_deployment_from_tool_config,
+    get_tool_config,
+)
+
+# the constants below are shared by all the tests, so tests must not modify them
+
+# what the jobs api answers when creating/updating a job
+_JOB_UNCHANGED_RESPONSE = JobsUpdateResponse(
+    messages=JobsResponseMessages(
+        error=None, info=["created continuous job my-job-name"], warning=None
+    ),
+).model_dump()
+_JOB_CHANGED_RESPONSE = {**_JOB_UNCHANGED_RESPONSE, "job_changed": True}
+# the jobs api answers without any messages
+_EMPTY_JOB_UPDATE_RESPONSE = JobsUpdateResponse().model_dump()
+_EMPTY_MESSAGES_RESPONSE = JobsResponseMessages().model_dump()
+_NO_JOBS_RESPONSE = JobsJobListResponse(jobs=[]).model_dump()
+
+# what the jobs api answers when listing the jobs of a tool that only has my-component
+_MY_COMPONENT_JOBS_RESPONSE = {
+    "jobs": [
+        {
+            "job_type": "continuous",
+            "cmd": "my cmd",
+            "image": "my-image",
+            "imagename": "my-imagename",
+            "image_state": "",
+            "name": "my-component",
+        }
+    ]
+}
+
+# the message of an unexpected error creating/updating a job
+_RUN_ERROR_MESSAGE = "Ayayayay!"
+
+# what get_tool_config() dumps to
+_DEFAULT_TOOL_CONFIG = get_tool_config().model_dump()
+
+
+# a component built from source and run with my-command
+_MY_REPO_COMPONENT = ContinuousComponentInfo(
+    build=SourceBuildInfo(
+        repository="https://gitlab-example.wikimedia.org/my-repo.git",
+        ref="main",
+    ),
+    run=ContinuousRunInfo(
+        command="my-command",
+    ),
+)
+
+
+# tool configs with components reusing my-component's build
+_ONE_REUSING_COMPONENT_TOOL_CONFIG = ToolConfig(
+    config_version="v1beta1",
+    components={
+        "my-component": _MY_REPO_COMPONENT,
+        "child-component": ContinuousComponentInfo(
+            build=SourceBuildReference(
+                reuse_from="my-component",
+            ),
+            run=ContinuousRunInfo(
+                command="my-second-command",
+            ),
+        ),
+    },
+)
+_TWO_REUSING_COMPONENTS_TOOL_CONFIG = ToolConfig(
+    config_version="v1beta1",
+    components={
+        "my-component": _MY_REPO_COMPONENT,
+        "first-component": ContinuousComponentInfo(
+            build=SourceBuildReference(
+                reuse_from="my-component",
+            ),
+            run=ContinuousRunInfo(
+                command="my-second-command",
+            ),
+        ),
+        "second-component": ContinuousComponentInfo(
+            build=SourceBuildReference(
+                reuse_from="my-component",
+            ),
+            run=ContinuousRunInfo(
+                command="my-third-command",
+            ),
+        ),
+    },
+)
+
+
+# the fields every expected deployment shares, tests add their builds, runs and status on top
+_BASE_EXPECTED_DEPLOYMENT = {
+    "deploy_id": "my-deploy-id",
+    "creation_time": "2021-06-01T00:00:00",
+    "tool_config": _DEFAULT_TOOL_CONFIG,
+    "force_build": False,
+    "force_run": False,
+}
+
+
+def _run_error() -> Exception:
+    # raising the same instance again would keep adding to its traceback
+    return Exception(_RUN_ERROR_MESSAGE)
+
+
+def _jobs_api_bad_request() -> requests.exceptions.HTTPError:
+    # a bad request error from jobs-api
+    error = requests.exceptions.HTTPError("Bad request", response=requests.Response())
+    # Gotten from a request from lima-kilo
+    # >>> response = requests.post("https://127.0.0.1:30003/jobs/v1/tool/tf-test/jobs", cert=("/data/project/tf-test/.toolskube/client.crt", "/data/project/tf-test/.toolskube/client.key"), json='{"fooo": 111}', verify=False)
+    # >>> try:
+    # ...    response.raise_for_status()
+    # ... except Exception as error:
+    # ...     myerr = error
+    # ...
+    # >>> myerr.response.content
+    # b'{"error":["1 validation error for NewJob\\n  Input should be a valid dictionary or instance of NewJob [type=model_type, input_value=\'{\\"fooo\\": 111}\', input_type=str]"]}\
+    error.response._content = b'{"error":["Ayayayay!"]}\n'
+    error.response.status_code = status.HTTP_400_BAD_REQUEST
+    error.response.url = "/bad/bad/url"
+    return error
+
+
+@dataclass(frozen=True)
+class _BuildScenario:
+    build_response: dict[str, Any]
+    # the model_dump() of the expected DeploymentBuildInfo/DeploymentRunInfo
+    expected_build: dict[str, Any]
+    expected_run: dict[str, Any]
+    expected_status: DeploymentState
+    expected_patch_calls: int
+    # makes the build wait time out right away
+    fast_forward_time: bool = False
+    # creating/updating the job raises an unexpected error
+    run_fails: bool = False
+    # the build state of the stored deployment before deploying
+    initial_build_state: DeploymentBuildState = DeploymentBuildState.pending
+
+
+_BUILD_FAILED_RUN = {
+    "run_status": DeploymentRunState.skipped,
+    "run_long_status": "Skipped due to previous failure",
+}
+_BUILD_NOT_STARTED = {
+    "build_id": "my-build",
+    "build_status": DeploymentBuildState.pending,
+    "build_image": DeploymentBuildInfo.NO_IMAGE_YET,
+    "build_long_status": "Not started yet",
+}
+_SINGLE_COMPONENT_SCENARIOS = [
+    pytest.param(
+        _BuildScenario(
+            build_response={
+                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
+                "destination_image": "tool-my-tool/my-component:latest",
+            },
+            expected_build={
+                "build_id": "my-build",
+                "build_status": DeploymentBuildState.successful,
+                "build_image": "tool-my-tool/my-component:latest",
+                "build_long_status": "You can see the logs with `toolforge build logs my-build`",
+            },
+            expected_run={
+                "run_status": DeploymentRunState.successful,
+                "run_long_status": "created or updated job my-component, [info](created continuous job my-job-name)",
+            },
+            expected_status=DeploymentState.successful,
+            expected_patch_calls=1,
+        ),
+        id="build-succeeds",
+    ),
+    *(
+        pytest.param(
+            _BuildScenario(
+                build_response={"status": build_status.value},
+                expected_build={
+                    "build_id": "my-build",
+                    "build_status": DeploymentBuildState.failed,
+                    "build_image": DeploymentBuildInfo.NO_IMAGE_YET,
+                    "build_long_status": "You can see the logs with `toolforge build logs my-build`",
+                },
+                expected_run=_BUILD_FAILED_RUN,
+                expected_status=DeploymentState.failed,
+                expected_patch_calls=0,
+                initial_build_state=DeploymentBuildState.failed,
+            ),
+            id=f"build-fails-{build_status.value}",
+        )
+        for build_status in (
+            BuildsBuildStatus.BUILD_FAILURE,
+            BuildsBuildStatus.BUILD_CANCELLED,
+        )
+    ),
+    *(
+        pytest.param(
+            _BuildScenario(
+                build_response={"status": build_status.value},
+                expected_build=_BUILD_NOT_STARTED,
+                expected_run=_BUILD_FAILED_RUN,
+                expected_status=DeploymentState.failed,
+                expected_patch_calls=0,
+                fast_forward_time=True,
+            ),
+            id=f"build-times-out-{build_status.value}",
+        )
+        for build_status in (
+            BuildsBuildStatus.BUILD_RUNNING,
+            BuildsBuildStatus.BUILD_UNKNOWN,
+        )
+    ),
+    pytest.param(
+        _BuildScenario(
+            build_response={
+                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
+                "destination_image": "tool-test-tool-1/component1:latest",
+            },
+            expected_build=_BUILD_NOT_STARTED,
+            expected_run=_BUILD_FAILED_RUN,
+            expected_status=DeploymentState.failed,
+            expected_patch_calls=0,
+            fast_forward_time=True,
+        ),
+        id="deployment-not-finished-in-1h",
+    ),
+    pytest.param(
+        _BuildScenario(
+            build_response={
+                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
+                "destination_image": "tool-my-tool/my-component:latest",
+            },
+            expected_build={
+                "build_id": "my-build",
+                "build_status": DeploymentBuildState.successful,
+                "build_image": "tool-my-tool/my-component:latest",
+                "build_long_status": "You can see the logs with `toolforge build logs my-build`",
+            },
+            expected_run={
+                "run_status": DeploymentRunState.failed,
+                "run_long_status": _RUN_ERROR_MESSAGE,
+            },
+            expected_status=DeploymentState.failed,
+            expected_patch_calls=1,
+            run_fails=True,
+        ),
+        id="run-fails",
+    ),
+]
+_MY_COMPONENT_JOB_PATCH = call(
+    "/jobs/v1/tool/my-tool/jobs/",
+    json={
+        "job_type": "continuous",
+        "cmd": "my-command",
+        "name": "my-component",
+        "imagename": "tool-my-tool/my-component:latest",
+    },
+    verify=True,
+)
 
-from .testlibs import get_defined_job, get_deployment_from_tool_config, get_tool_config
+
+@dataclass(frozen=True)
+class _ExistingBuildScenario:
+    force_build: bool
+    # what the builds api answers, in order
+    get_responses: tuple[dict[str, Any], ...]
+    patch_response: dict[str, Any]
+    # the model_dump() of the expected DeploymentBuildInfo
+    expected_build: dict[str, Any]
+    expected_run_long_status: str
+    expected_post_calls: int
+
+
+# a successful build of my-component started from the same ref we are deploying
+_EXISTING_BUILDS_RESPONSE = {
+    "builds": [
+        {
+            "build_id": "random_existing_build_id",
+            "name": "my-component",
+            "resolved_ref": "same-ref-as-build",
+            "destination_image": "my-tool/my-component:latest",
+            "status": BuildsBuildStatus.BUILD_SUCCESS.value,
+            "parameters": {
+                "image_name": "my-component",
+                "source_url": "my-url",
+            },
+        }
+    ]
+}
+_EXISTING_BUILD_SCENARIOS = [
+    pytest.param(
+        _ExistingBuildScenario(
+            force_build=False,
+            get_responses=(
+                _EXISTING_BUILDS_RESPONSE,
+                {
+                    "build": {
+                        "status": BuildsBuildStatus.BUILD_SUCCESS.value,
+                        "destination_image": "my-tool/my-component:latest",
+                    }
+                },
+            ),
+            patch_response=_JOB_UNCHANGED_RESPONSE,
+            expected_build={
+                "build_id": "random_existing_build_id",
+                "build_status": DeploymentBuildState.skipped,
+                "build_image": "my-tool/my-component:latest",
+                "build_long_status": "Reusing existing build",
+            },
+            expected_run_long_status="job my-component is already up to date, [info](created continuous job my-job-name)",
+            expected_post_calls=0,
+        ),
+        id="skips-build",
+    ),
+    pytest.param(
+        _ExistingBuildScenario(
+            force_build=True,
+            get_responses=(
+                {
+                    "build": {
+                        "status": BuildsBuildStatus.BUILD_SUCCESS.value,
+                        "destination_image": "tool-test-tool-1/component1:latest",
+                    }
+                },
+            ),
+            patch_response=_JOB_CHANGED_RESPONSE,
+            expected_build={
+                "build_id": "new_build_name",
+                "build_status": DeploymentBuildState.successful,
+                "build_image": "tool-test-tool-1/component1:latest",
+                "build_long_status": "You can see the logs with `toolforge build logs new_build_name`",
+            },
+            expected_run_long_status="created or updated job my-component, [info](created continuous job my-job-name)",
+            expected_post_calls=1,
+        ),
+        id="force-build-rebuilds",
+    ),
+]
 
 
+@pytest.mark.xdist_group("deploy_task")
 class TestDoDeploy:
-    def test_skip_build_if_no_change_in_ref_hash_and_existing_build(
+    @pytest.mark.parametrize("scenario", _EXISTING_BUILD_SCENARIOS)
+    def test_deploys_when_build_with_same_ref_exists(
         self,
+        runtime: Runtime,
+        scenario: _ExistingBuildScenario,
         monkeypatch: MonkeyPatch,
+        my_tool_config: ToolConfig,
+        storage: Storage,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
-        my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
-
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
+        my_deployment = get_deployment_from_tool_config(
+            tool_config=my_tool_config, force_build=scenario.force_build
         )
+        storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
 
         monkeypatch.setattr(
             "components.runtime.toolforge._resolve_ref",
             lambda *args, **kwargs: "same-ref-as-build",
         )
 
-        existing_build_id = "random_existing_build_id"
-        toolforge_client_mock.get.side_effect = [
-            {
-                "builds": [
-                    {
-                        "build_id": existing_build_id,
-                        "name": "my-component",
-                        "resolved_ref": "same-ref-as-build",
-                        "destination_image": "my-tool/my-component:latest",
-                        "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                        "parameters": {
-                            "image_name": "my-component",
-                            "source_url": "my-url",
-                        },
-                    }
-                ]
+        fake_toolforge_client.get_side_effect = scenario.get_responses
+        fake_toolforge_client.post_return = {"new_build": {"name": "new_build_name"}}
+        fake_toolforge_client.patch_return = scenario.patch_response
+
+        expected_deployment = {
+            **_BASE_EXPECTED_DEPLOYMENT,
+            "builds": {
+                "my-component": scenario.expected_build,
             },
-            {
-                "build": {
-                    "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                    "destination_image": "my-tool/my-component:latest",
-                }
+            "runs": {
+                "my-component": {
+                    "run_status": DeploymentRunState.successful,
+                    "run_long_status": scenario.expected_run_long_status,
+                },
             },
-        ]
-        toolforge_client_mock.post.return_value = {
-            "new_build": {"name": "my-component"}
+            "status": DeploymentState.successful,
+            "force_build": scenario.force_build,
         }
-        toolforge_client_mock.patch.return_value = JobsUpdateResponse(
-            messages=JobsResponseMessages(
-                error=None, info=["created continuous job my-job-name"], warning=None
-            ),
-        ).model_dump()
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id=existing_build_id,
-                        build_status=DeploymentBuildState.skipped,
-                        build_long_status="Reusing existing build",
-                        build_image="my-tool/my-component:latest",
-                    )
-                },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.successful,
-                        run_long_status="job my-component is already up to date, [info](created continuous job my-job-name)",
-                    )
-                },
-                tool_config=get_tool_config(),
-                status=DeploymentState.successful,
-                long_status="I will not be checked",
-            )
-        ]
 
         do_deploy(
             deployment=my_deployment,
-            storage=my_storage,
+            storage=storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
+            runtime=runtime,
         )
 
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
+        gotten_deployments = storage.list_deployments(tool_name="my-tool")
 
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_called_once()
+        assert_deployments_equal(gotten_deployments, [expected_deployment])
+        assert len(fake_toolforge_client.patch_calls) == 1
+        assert len(fake_toolforge_client.post_calls) == scenario.expected_post_calls
 
     @pytest.mark.parametrize(
         "existing_build_start_status",
@@ -140,27 +439,21 @@ class TestDoDeploy:
     )
     def test_follow_up_existing_build_if_no_change_in_ref_hash_and_existing_build_running(
         self,
+        runtime: Runtime,
         monkeypatch: MonkeyPatch,
         existing_build_start_status: BuildsBuildStatus,
+        my_tool_config: ToolConfig,
+        my_deployment: Deployment,
+        my_storage: Storage,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
-        my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
-
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-
         monkeypatch.setattr(
             "components.runtime.toolforge._resolve_ref",
             lambda *args, **kwargs: "same-ref-as-build",
         )
 
         existing_build_id = "random_existing_build_id"
-        toolforge_client_mock.get.side_effect = [
+        fake_toolforge_client.get_side_effect = (
             {
                 "builds": [
                     {
@@ -182,600 +475,194 @@ class TestDoDeploy:
                     "destination_image": "my-tool/my-component:latest",
                 }
             },
-            JobsJobListResponse(jobs=[]).model_dump(),
-        ]
-        toolforge_client_mock.post.return_value = {
-            "new_build": {"name": "my-component"}
-        }
-        toolforge_client_mock.patch.return_value = JobsUpdateResponse(
-            messages=JobsResponseMessages(
-                error=None, info=["created continuous job my-job-name"], warning=None
-            ),
-            job_changed=True,
-        ).model_dump()
-        toolforge_client_mock.delete.return_value = JobsResponseMessages().model_dump()
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id=existing_build_id,
-                        build_status=DeploymentBuildState.successful,
-                        build_long_status="You can see the logs with `toolforge build logs random_existing_build_id`",
-                        build_image="my-tool/my-component:latest",
-                    )
-                },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.successful,
-                        run_long_status="created or updated job my-component, [info](created continuous job my-job-name)",
-                    )
-                },
-                tool_config=get_tool_config(),
-                status=DeploymentState.successful,
-                long_status="I will not be checked",
-            )
-        ]
-
-        do_deploy(
-            deployment=my_deployment,
-            storage=my_storage,
-            tool_config=my_tool_config,
-            tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
-        )
-
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
-
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_called_once()
-
-    def test_does_not_skip_build_if_no_change_in_ref_hash_and_existing_build_but_force_build_passed(
-        self,
-        monkeypatch: MonkeyPatch,
-    ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
-        my_deployment = get_deployment_from_tool_config(
-            tool_config=my_tool_config, force_build=True
-        )
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
-
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-
-        monkeypatch.setattr(
-            "components.runtime.toolforge._resolve_ref",
-            lambda *args, **kwargs: "same-ref-as-build",
-        )
-
-        toolforge_client_mock.post.return_value = {
-            "new_build": {"name": "new_build_name"}
-        }
-        toolforge_client_mock.get.return_value = {
-            "build": {
-                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                "destination_image": "tool-test-tool-1/component1:latest",
-            }
-        }
-        toolforge_client_mock.patch.return_value = JobsUpdateResponse(
-            messages=JobsResponseMessages(
-                error=None, info=["created continuous job my-job-name"], warning=None
-            ),
-            job_changed=True,
-        ).model_dump()
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="new_build_name",
-                        build_status=DeploymentBuildState.successful,
-                        build_long_status="You can see the logs with `toolforge build logs new_build_name`",
-                        build_image="tool-test-tool-1/component1:latest",
-                    )
-                },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.successful,
-                        run_long_status="created or updated job my-component, [info](created continuous job my-job-name)",
-                    )
-                },
-                tool_config=get_tool_config(),
-                status=DeploymentState.successful,
-                long_status="I will not be checked",
-                force_build=True,
-            ),
-        ]
-
-        do_deploy(
-            deployment=my_deployment,
-            storage=my_storage,
-            tool_config=my_tool_config,
-            tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
-        )
-
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
-
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_called_once()
-        toolforge_client_mock.post.assert_called_once()
-
-    def test_starts_build_and_runs_single_continuous_component(
-        self, monkeypatch: MonkeyPatch
-    ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
-        my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
-
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
+            _NO_JOBS_RESPONSE,
         )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.return_value = {
-            "build": {
-                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                "destination_image": "tool-my-tool/my-component:latest",
-            }
-        }
-        toolforge_client_mock.patch.return_value = JobsUpdateResponse(
-            messages=JobsResponseMessages(
-                error=None, info=["created continuous job my-job-name"], warning=None
-            ),
-            job_changed=True,
-        ).model_dump()
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.successful,
-                        build_long_status="You can see the logs with `toolforge build logs my-build`",
-                        build_image="tool-my-tool/my-component:latest",
-                    )
+        fake_toolforge_client.post_return = {"new_build": {"name": "my-component"}}
+        fake_toolforge_client.patch_return = _JOB_CHANGED_RESPONSE
+        fake_toolforge_client.delete_return = _EMPTY_MESSAGES_RESPONSE
+
+        expected_deployment = {
+            **_BASE_EXPECTED_DEPLOYMENT,
+            "builds": {
+                "my-component": {
+                    "build_id": existing_build_id,
+                    "build_status": DeploymentBuildState.successful,
+                    "build_image": "my-tool/my-component:latest",
+                    "build_long_status": "You can see the logs with `toolforge build logs random_existing_build_id`",
                 },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.successful,
-                        run_long_status="created or updated job my-component, [info](created continuous job my-job-name)",
-                    )
+            },
+            "runs": {
+                "my-component": {
+                    "run_status": DeploymentRunState.successful,
+                    "run_long_status": "created or updated job my-component, [info](created continuous job my-job-name)",
                 },
-                tool_config=get_tool_config(),
-                status=DeploymentState.successful,
-                long_status="I will not be checked",
-            )
-        ]
-
-        do_deploy(
-            deployment=my_deployment,
-            storage=my_storage,
-            tool_config=my_tool_config,
-            tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
-        )
-
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
-
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_called_once()
-
-    @pytest.mark.parametrize(
-        "build_status",
-        [
-            BuildsBuildStatus.BUILD_FAILURE,
-            BuildsBuildStatus.BUILD_CANCELLED,
-        ],
-    )
-    def test_fails_deployment_if_build_fails(
-        self, monkeypatch: MonkeyPatch, build_status: BuildsBuildStatus
-    ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
-        my_deployment = get_deployment_from_tool_config(
-            tool_config=my_tool_config, with_build_state=DeploymentBuildState.failed
-        )
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
-
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.return_value = {
-            "build": {"status": build_status.value}
+            },
+            "status": DeploymentState.successful,
         }
 
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.failed,
-                        build_long_status="You can see the logs with `toolforge build logs my-build`",
-                    )
-                },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.skipped,
-                        run_long_status="Skipped due to previous failure",
-                    )
-                },
-                tool_config=get_tool_config(),
-                status=DeploymentState.failed,
-                long_status="I will not be checked",
-            )
-        ]
-
         do_deploy(
             deployment=my_deployment,
             storage=my_storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
-        )
-
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
-
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_not_called()
-
-    @pytest.mark.parametrize(
-        "build_status",
-        [
-            BuildsBuildStatus.BUILD_RUNNING,
-            BuildsBuildStatus.BUILD_UNKNOWN,
-        ],
-    )
-    def test_fails_deployment_if_build_times_out(
-        self,
-        monkeypatch: MonkeyPatch,
-        build_status: BuildsBuildStatus,
-    ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
-        my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
-
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
+            runtime=runtime,
         )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.return_value = {
-            "build": {"status": build_status.value}
-        }
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.pending,
-                        build_long_status="Not started yet",
-                    )
-                },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.skipped,
-                        run_long_status="Skipped due to previous failure",
-                    )
-                },
-                tool_config=get_tool_config(),
-                status=DeploymentState.failed,
-                long_status="I will not be checked",
-            )
-        ]
-
-        with freeze_time(
-            datetime.datetime.now(),
-            auto_tick_seconds=60 * 60 * 24,
-            tick=True,
-        ):
-            do_deploy(
-                deployment=my_deployment,
-                storage=my_storage,
-                tool_config=my_tool_config,
-                tool_name="my-tool",
-                runtime=get_runtime(settings=get_settings()),
-            )
 
         gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
 
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_not_called()
+        assert_deployments_equal(gotten_deployments, [expected_deployment])
+        assert len(fake_toolforge_client.patch_calls) == 1
 
-    def test_times_out_deployment_not_finished_in_1h(
+    @pytest.mark.parametrize("scenario", _SINGLE_COMPONENT_SCENARIOS)
+    def test_deploys_single_continuous_component(
         self,
-        monkeypatch: MonkeyPatch,
+        runtime: Runtime,
+        scenario: _BuildScenario,
+        my_tool_config: ToolConfig,
+        storage: Storage,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
-        my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
-
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.return_value = {
-            "build": {
-                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                "destination_image": "tool-test-tool-1/component1:latest",
-            }
-        }
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.pending,
-                        build_long_status="Not started yet",
-                    )
-                },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.skipped,
-                        run_long_status="Skipped due to previous failure",
-                    )
-                },
-                tool_config=get_tool_config(),
-                status=DeploymentState.failed,
-                long_status="I will not be checked",
-            )
-        ]
-
-        with freeze_time(
-            datetime.datetime.now(),
-            auto_tick_seconds=60 * 60 * 24,
-            tick=True,
-        ):
-            do_deploy(
-                deployment=my_deployment,
-                storage=my_storage,
-                tool_config=my_tool_config,
-                tool_name="my-tool",
-                runtime=get_runtime(settings=get_settings()),
-            )
-
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
-
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_not_called()
-
-    def test_fails_deployment_if_run_fails(self, monkeypatch: MonkeyPatch):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
-        my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
-
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
+        my_deployment = get_deployment_from_tool_config(
+            tool_config=my_tool_config, with_build_state=scenario.initial_build_state
         )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.return_value = {
-            "build": {
-                "status": BuildsBuildStatus.BUILD_SUCCESS.value,
-                "destination_image": "tool-my-tool/my-component:latest",
-            }
+        storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
+
+        fake_toolforge_client.post_return = {"new_build": {"name": "my-build"}}
+        fake_toolforge_client.get_return = {"build": scenario.build_response}
+        fake_toolforge_client.patch_return = _JOB_CHANGED_RESPONSE
+        if scenario.run_fails:
+            fake_toolforge_client.patch_side_effect = _run_error()
+
+        expected_deployment = {
+            **_BASE_EXPECTED_DEPLOYMENT,
+            "builds": {
+                "my-component": scenario.expected_build,
+            },
+            "runs": {
+                "my-component": scenario.expected_run,
+            },
+            "status": scenario.expected_status,
         }
-        toolforge_client_mock.patch.side_effect = Exception("Ayayayay!")
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.successful,
-                        build_long_status="You can see the logs with `toolforge build logs my-build`",
-                        build_image="tool-my-tool/my-component:latest",
-                    )
-                },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.failed,
-                        run_long_status="Ayayayay!",
-                    )
-                },
-                tool_config=get_tool_config(),
-                status=DeploymentState.failed,
-                long_status="I will not be checked",
-            )
-        ]
 
+        clock_step = datetime.timedelta(0)
+        if scenario.fast_forward_time:
+            # every time the deploy checks the time, a day has passed
+            clock_step = datetime.timedelta(days=1)
+        clock = FakeClock(start=datetime.datetime.now(), step=clock_step)
         do_deploy(
             deployment=my_deployment,
-            storage=my_storage,
+            storage=storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
+            runtime=runtime,
+            now=clock.now,
         )
 
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
+        gotten_deployments = storage.list_deployments(tool_name="my-tool")
 
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_called_with(
-            "/jobs/v1/tool/my-tool/jobs/",
-            json={
-                "job_type": "continuous",
-                "cmd": "my-command",
-                "name": "my-component",
-                "imagename": "tool-my-tool/my-component:latest",
-            },
-            verify=True,
+        assert_deployments_equal(gotten_deployments, [expected_deployment])
+        assert (
+            fake_toolforge_client.patch_calls
+            == [_MY_COMPONENT_JOB_PATCH] * scenario.expected_patch_calls
         )
 
     def test_fails_deployment_if_one_run_fails_but_others_succeed(
-        self, monkeypatch: MonkeyPatch
+        self,
+        runtime: Runtime,
+        storage: Storage,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        my_storage = MockStorage()
         my_tool_config = get_tool_config(
             components={
-                "failed-component": ContinuousComponentInfo(
-                    build=SourceBuildInfo(
-                        repository="https://gitlab-example.wikimedia.org/my-repo.git",
-                        ref="main",
-                    ),
-                    run=ContinuousRunInfo(
-                        command="my-command",
-                    ),
-                ),
-                "successful-component": ContinuousComponentInfo(
-                    component_type="continuous",
-                    build=SourceBuildInfo(
-                        repository="https://gitlab-example.wikimedia.org/my-repo.git",
-                        ref="main",
-                    ),
-                    run=ContinuousRunInfo(
-                        command="my-command",
-                    ),
-                ),
+                "failed-component": _MY_REPO_COMPONENT,
+                "successful-component": _MY_REPO_COMPONENT,
             }
         )
         my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
+        storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
 
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.return_value = {
+        fake_toolforge_client.post_return = {"new_build": {"name": "my-build"}}
+        fake_toolforge_client.get_return = {
             "build": {
                 "status": BuildsBuildStatus.BUILD_SUCCESS.value,
                 "destination_image": "tool-my-tool/failed-component:latest",
             }
         }
-        toolforge_client_mock.patch.side_effect = [
-            Exception("Ayayayay!"),
+        fake_toolforge_client.patch_side_effect = (
+            _run_error(),
             {},
-        ]
+        )
 
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "failed-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.successful,
-                        build_long_status="You can see the logs with `toolforge build logs my-build`",
-                        build_image="tool-my-tool/failed-component:latest",
-                    ),
-                    "successful-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.successful,
-                        build_long_status="You can see the logs with `toolforge build logs my-build`",
-                        build_image="tool-my-tool/failed-component:latest",
-                    ),
+        expected_deployment = {
+            **_BASE_EXPECTED_DEPLOYMENT,
+            "builds": {
+                "failed-component": {
+                    "build_id": "my-build",
+                    "build_status": DeploymentBuildState.successful,
+                    "build_image": "tool-my-tool/failed-component:latest",
+                    "build_long_status": "You can see the logs with `toolforge build logs my-build`",
                 },
-                runs={
-                    "failed-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.failed,
-                        run_long_status="Ayayayay!",
-                    ),
-                    "successful-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.skipped,
-                        run_long_status="Skipped due to previous failure",
-                    ),
+                "successful-component": {
+                    "build_id": "my-build",
+                    "build_status": DeploymentBuildState.successful,
+                    "build_image": "tool-my-tool/failed-component:latest",
+                    "build_long_status": "You can see the logs with `toolforge build logs my-build`",
                 },
-                tool_config=my_tool_config,
-                status=DeploymentState.failed,
-                long_status="I will not be checked",
-            )
-        ]
+            },
+            "runs": {
+                "failed-component": {
+                    "run_status": DeploymentRunState.failed,
+                    "run_long_status": _RUN_ERROR_MESSAGE,
+                },
+                "successful-component": {
+                    "run_status": DeploymentRunState.skipped,
+                    "run_long_status": "Skipped due to previous failure",
+                },
+            },
+            "tool_config": my_tool_config.model_dump(),
+            "status": DeploymentState.failed,
+        }
 
         do_deploy(
             deployment=my_deployment,
-            storage=my_storage,
+            storage=storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
+            runtime=runtime,
         )
 
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
+        gotten_deployments = storage.list_deployments(tool_name="my-tool")
 
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
+        assert_deployments_equal(gotten_deployments, [expected_deployment])
         # runs are serial for now, it will fail on the first and not try the second
-        toolforge_client_mock.patch.assert_called_once_with(
-            "/jobs/v1/tool/my-tool/jobs/",
-            json={
-                "job_type": "continuous",
-                "cmd": "my-command",
-                "name": "failed-component",
-                "imagename": "tool-my-tool/failed-component:latest",
-            },
-            verify=True,
-        )
+        assert fake_toolforge_client.patch_calls == [
+            call(
+                "/jobs/v1/tool/my-tool/jobs/",
+                json={
+                    "job_type": "continuous",
+                    "cmd": "my-command",
+                    "name": "failed-component",
+                    "imagename": "tool-my-tool/failed-component:latest",
+                },
+                verify=True,
+            )
+        ]
 
-    def test_cancels_builds_when_deploy_is_cancelled(self, monkeypatch: MonkeyPatch):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
+    def test_cancels_builds_when_deploy_is_cancelled(
+        self,
+        runtime: Runtime,
+        my_tool_config: ToolConfig,
+        storage: Storage,
+        monkeypatch: MonkeyPatch,
+        fake_toolforge_client: FakeToolforgeClient,
+    ):
         my_deployment = get_deployment_from_tool_config(
             tool_config=my_tool_config, with_build_state=DeploymentBuildState.failed
         )
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
+        storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
 
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.return_value = {
+        fake_toolforge_client.post_return = {"new_build": {"name": "my-build"}}
+        fake_toolforge_client.get_return = {
             "build": {"status": BuildsBuildStatus.BUILD_RUNNING.value}
         }
 
@@ -790,154 +677,122 @@ class TestDoDeploy:
                 count += 1
             return my_deployment
 
-        monkeypatch.setattr(my_storage, "get_deployment", fake_get_deployment)
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.cancelled,
-                        build_long_status="You can see the logs with `toolforge build logs my-build`",
-                    )
+        monkeypatch.setattr(storage, "get_deployment", fake_get_deployment)
+
+        expected_deployment = {
+            **_BASE_EXPECTED_DEPLOYMENT,
+            "builds": {
+                "my-component": {
+                    "build_id": "my-build",
+                    "build_status": DeploymentBuildState.cancelled,
+                    "build_image": DeploymentBuildInfo.NO_IMAGE_YET,
+                    "build_long_status": "You can see the logs with `toolforge build logs my-build`",
                 },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.skipped,
-                        run_long_status="The deployment was cancelled",
-                    )
+            },
+            "runs": {
+                "my-component": {
+                    "run_status": DeploymentRunState.skipped,
+                    "run_long_status": "The deployment was cancelled",
                 },
-                tool_config=get_tool_config(),
-                status=DeploymentState.cancelled,
-                long_status="Deployment was cancelled",
-            )
-        ]
+            },
+            "status": DeploymentState.cancelled,
+            "long_status": "Deployment was cancelled",
+        }
 
         do_deploy(
             deployment=my_deployment,
-            storage=my_storage,
+            storage=storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
+            runtime=runtime,
         )
 
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
+        gotten_deployments = storage.list_deployments(tool_name="my-tool")
 
-        # make sure that we have some deployments
-        assert gotten_deployments
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_not_called()
+        assert_deployments_equal(
+            gotten_deployments, [expected_deployment], ignore=frozenset()
+        )
+        assert fake_toolforge_client.patch_calls == []
 
     def test_parses_jobs_api_http_error_messages_when_run_fails(
-        self, monkeypatch: MonkeyPatch
+        self,
+        runtime: Runtime,
+        my_tool_config: ToolConfig,
+        my_deployment: Deployment,
+        my_storage: Storage,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
-        my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
-
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.return_value = {
+        fake_toolforge_client.post_return = {"new_build": {"name": "my-build"}}
+        fake_toolforge_client.get_return = {
             "build": {
                 "status": BuildsBuildStatus.BUILD_SUCCESS.value,
                 "destination_image": "tool-my-tool/my-component:latest",
             }
         }
-        # Fake a bad request error from jobs-api
-        http_error = requests.exceptions.HTTPError(
-            "Bad request", response=requests.Response()
-        )
-        # Gotten from a request from lima-kilo
-        # >>> response = requests.post("https://127.0.0.1:30003/jobs/v1/tool/tf-test/jobs", cert=("/data/project/tf-test/.toolskube/client.crt", "/data/project/tf-test/.toolskube/client.key"), json='{"fooo": 111}', verify=False)
-        # >>> try:
-        # ...    response.raise_for_status()
-        # ... except Exception as error:
-        # ...     myerr = error
-        # ...
-        # >>> myerr.response.content
-        # b'{"error":["1 validation error for NewJob\\n  Input should be a valid dictionary or instance of NewJob [type=model_type, input_value=\'{\\"fooo\\": 111}\', input_type=str]"]}\
-        http_error.response._content = b'{"error":["Ayayayay!"]}\n'
-        http_error.response.status_code = status.HTTP_400_BAD_REQUEST
-        http_error.response.url = "/bad/bad/url"
-        toolforge_client_mock.patch.side_effect = [http_error]
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.successful,
-                        build_long_status="You can see the logs with `toolforge build logs my-build`",
-                        build_image="tool-my-tool/my-component:latest",
-                    ),
+        fake_toolforge_client.patch_side_effect = (_jobs_api_bad_request(),)
+
+        expected_deployment = {
+            **_BASE_EXPECTED_DEPLOYMENT,
+            "builds": {
+                "my-component": {
+                    "build_id": "my-build",
+                    "build_status": DeploymentBuildState.successful,
+                    "build_image": "tool-my-tool/my-component:latest",
+                    "build_long_status": "You can see the logs with `toolforge build logs my-build`",
                 },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.failed,
-                        run_long_status="Bad request (400): Ayayayay!",
-                    ),
+            },
+            "runs": {
+                "my-component": {
+                    "run_status": DeploymentRunState.failed,
+                    "run_long_status": "Bad request (400): Ayayayay!",
                 },
-                tool_config=get_tool_config(),
-                status=DeploymentState.failed,
-                long_status="I will not be checked",
-            )
-        ]
+            },
+            "status": DeploymentState.failed,
+        }
 
         do_deploy(
             deployment=my_deployment,
             storage=my_storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
+            runtime=runtime,
         )
 
         gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
 
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_called_once_with(
-            "/jobs/v1/tool/my-tool/jobs/",
-            json={
-                "job_type": "continuous",
-                "cmd": "my-command",
-                "name": "my-component",
-                "imagename": "tool-my-tool/my-component:latest",
-            },
-            verify=True,
-        )
+        assert_deployments_equal(gotten_deployments, [expected_deployment])
+        assert fake_toolforge_client.patch_calls == [
+            call(
+                "/jobs/v1/tool/my-tool/jobs/",
+                json={
+                    "job_type": "continuous",
+                    "cmd": "my-command",
+                    "name": "my-component",
+                    "imagename": "tool-my-tool/my-component:latest",
+                },
+                verify=True,
+            )
+        ]
 
     def test_reruns_job_even_if_config_did_not_change_and_build_skipped_if_force_run_passed(
-        self, monkeypatch: MonkeyPatch
+        self,
+        runtime: Runtime,
+        my_tool_config: ToolConfig,
+        storage: Storage,
+        monkeypatch: MonkeyPatch,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
         my_deployment = get_deployment_from_tool_config(
             tool_config=my_tool_config, force_run=True
         )
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
+        storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
 
         monkeypatch.setattr(
             "components.runtime.toolforge._resolve_ref",
             lambda *args, **kwargs: "same-ref-as-build",
         )
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.side_effect = [
+        fake_toolforge_client.post_return = {"new_build": {"name": "my-build"}}
+        fake_toolforge_client.get_side_effect = (
             {
                 "builds": [
                     {
@@ -953,55 +808,43 @@ class TestDoDeploy:
                     }
                 ]
             },
-            JobsJobListResponse(jobs=[get_defined_job(name="my-component")]),
-        ]
-        toolforge_client_mock.delete.return_value = JobsJobResponse().model_dump()
-        toolforge_client_mock.patch.return_value = JobsUpdateResponse(
-            messages=JobsResponseMessages(
-                error=None, info=["created continuous job my-job-name"], warning=None
-            )
-        ).model_dump()
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="existing-build-id",
-                        build_status=DeploymentBuildState.skipped,
-                        build_long_status="Reusing existing build",
-                        build_image="tool-my-tool/my-component:latest",
-                    )
+            _MY_COMPONENT_JOBS_RESPONSE,
+        )
+        fake_toolforge_client.delete_return = JOB_RESPONSE
+        fake_toolforge_client.patch_return = _JOB_UNCHANGED_RESPONSE
+
+        expected_deployment = {
+            **_BASE_EXPECTED_DEPLOYMENT,
+            "builds": {
+                "my-component": {
+                    "build_id": "existing-build-id",
+                    "build_status": DeploymentBuildState.skipped,
+                    "build_image": "tool-my-tool/my-component:latest",
+                    "build_long_status": "Reusing existing build",
                 },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.successful,
-                        run_long_status="restarted job my-component, [info](created continuous job my-job-name)",
-                    )
+            },
+            "runs": {
+                "my-component": {
+                    "run_status": DeploymentRunState.successful,
+                    "run_long_status": "restarted job my-component, [info](created continuous job my-job-name)",
                 },
-                tool_config=get_tool_config(),
-                status=DeploymentState.successful,
-                long_status="I will not be checked",
-                force_run=True,
-            )
-        ]
+            },
+            "status": DeploymentState.successful,
+            "force_run": True,
+        }
 
         do_deploy(
             deployment=my_deployment,
-            storage=my_storage,
+            storage=storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
+            runtime=runtime,
         )
 
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
+        gotten_deployments = storage.list_deployments(tool_name="my-tool")
 
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_called_with(
+        assert_deployments_equal(gotten_deployments, [expected_deployment])
+        assert fake_toolforge_client.patch_calls[-1] == call(
             "/jobs/v1/tool/my-tool/jobs/",
             json={
                 "job_type": "continuous",
@@ -1011,27 +854,24 @@ class TestDoDeploy:
             },
             verify=True,
         )
-        toolforge_client_mock.post.assert_called_with(
+        assert fake_toolforge_client.post_calls[-1] == call(
             "/jobs/v1/tool/my-tool/jobs/my-component/restart/", verify=True
         )
 
     def test_reruns_job_even_if_config_did_not_change_and_force_run_not_passed_if_build_ran(
-        self, monkeypatch: MonkeyPatch
+        self,
+        runtime: Runtime,
+        my_tool_config: ToolConfig,
+        storage: Storage,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        my_storage = MockStorage()
-        my_tool_config = get_tool_config()
         my_deployment = get_deployment_from_tool_config(
             tool_config=my_tool_config, force_run=False
         )
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
+        storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
 
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.side_effect = [
+        fake_toolforge_client.post_return = {"new_build": {"name": "my-build"}}
+        fake_toolforge_client.get_side_effect = (
             {
                 "build": {
                     "status": BuildsBuildStatus.BUILD_SUCCESS.value,
@@ -1044,55 +884,42 @@ class TestDoDeploy:
                     "destination_image": "tool-my-tool/my-component:latest",
                 }
             },
-            JobsJobListResponse(jobs=[get_defined_job(name="my-component")]),
-        ]
-        toolforge_client_mock.delete.return_value = JobsJobResponse().model_dump()
-        toolforge_client_mock.patch.return_value = JobsUpdateResponse(
-            messages=JobsResponseMessages(
-                error=None, info=["created continuous job my-job-name"], warning=None
-            )
-        ).model_dump()
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.successful,
-                        build_long_status="You can see the logs with `toolforge build logs my-build`",
-                        build_image="tool-my-tool/my-component:latest",
-                    )
+            _MY_COMPONENT_JOBS_RESPONSE,
+        )
+        fake_toolforge_client.delete_return = JOB_RESPONSE
+        fake_toolforge_client.patch_return = _JOB_UNCHANGED_RESPONSE
+
+        expected_deployment = {
+            **_BASE_EXPECTED_DEPLOYMENT,
+            "builds": {
+                "my-component": {
+                    "build_id": "my-build",
+                    "build_status": DeploymentBuildState.successful,
+                    "build_image": "tool-my-tool/my-component:latest",
+                    "build_long_status": "You can see the logs with `toolforge build logs my-build`",
                 },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.successful,
-                        run_long_status="restarted job my-component, [info](created continuous job my-job-name)",
-                    )
+            },
+            "runs": {
+                "my-component": {
+                    "run_status": DeploymentRunState.successful,
+                    "run_long_status": "restarted job my-component, [info](created continuous job my-job-name)",
                 },
-                tool_config=get_tool_config(),
-                status=DeploymentState.successful,
-                long_status="I will not be checked",
-                force_run=False,
-            )
-        ]
+            },
+            "status": DeploymentState.successful,
+        }
 
         do_deploy(
             deployment=my_deployment,
-            storage=my_storage,
+            storage=storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
+            runtime=runtime,
         )
 
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
+        gotten_deployments = storage.list_deployments(tool_name="my-tool")
 
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-        toolforge_client_mock.patch.assert_called_with(
+        assert_deployments_equal(gotten_deployments, [expected_deployment])
+        assert fake_toolforge_client.patch_calls[-1] == call(
             "/jobs/v1/tool/my-tool/jobs/",
             json={
                 "job_type": "continuous",
@@ -1102,53 +929,21 @@ class TestDoDeploy:
             },
             verify=True,
         )
-        toolforge_client_mock.post.assert_called_with(
+        assert fake_toolforge_client.post_calls[-1] == call(
             "/jobs/v1/tool/my-tool/jobs/my-component/restart/", verify=True
         )
 
     def test_reruns_job_for_reused_components_when_build_changed(
-        self, monkeypatch: MonkeyPatch
+        self,
+        runtime: Runtime,
+        storage: Storage,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        my_storage = MockStorage()
-        my_tool_config = ToolConfig(
-            config_version="v1beta1",
-            components={
-                "my-component": ContinuousComponentInfo(
-                    build=SourceBuildInfo(
-                        repository="https://gitlab-example.wikimedia.org/my-repo.git",
-                        ref="main",
-                    ),
-                    run=ContinuousRunInfo(
-                        command="my-command",
-                    ),
-                ),
-                "first-component": ContinuousComponentInfo(
-                    build=SourceBuildReference(
-                        reuse_from="my-component",
-                    ),
-                    run=ContinuousRunInfo(
-                        command="my-second-command",
-                    ),
-                ),
-                "second-component": ContinuousComponentInfo(
-                    build=SourceBuildReference(
-                        reuse_from="my-component",
-                    ),
-                    run=ContinuousRunInfo(
-                        command="my-third-command",
-                    ),
-                ),
-            },
-        )
+        my_tool_config = _TWO_REUSING_COMPONENTS_TOOL_CONFIG
         my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
+        storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
 
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
+        fake_toolforge_client.post_return = {"new_build": {"name": "my-build"}}
 
         # This needs to be parseable in `_do_run` or we skip the restart logic block,
         # which makes everything always created, making this test redundant.
@@ -1171,154 +966,111 @@ class TestDoDeploy:
                 }
             }
 
-        toolforge_client_mock.get = _mock_get_side_effect
+        fake_toolforge_client.get_side_effect = _mock_get_side_effect
 
-        toolforge_client_mock.patch.return_value = JobsUpdateResponse().model_dump()
+        fake_toolforge_client.patch_return = _EMPTY_JOB_UPDATE_RESPONSE
 
-        toolforge_client_mock.delete.return_value = JobsJobResponse().model_dump()
+        fake_toolforge_client.delete_return = JOB_RESPONSE
 
         do_deploy(
             deployment=my_deployment,
-            storage=my_storage,
+            storage=storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
+            runtime=runtime,
         )
 
-        toolforge_client_mock.post.assert_has_calls(
-            [
-                call("/jobs/v1/tool/my-tool/jobs/my-component/restart/", verify=True),
-                call(
-                    "/jobs/v1/tool/my-tool/jobs/first-component/restart/", verify=True
-                ),
-                call(
-                    "/jobs/v1/tool/my-tool/jobs/second-component/restart/", verify=True
-                ),
-            ],
-            any_order=True,
-        )
+        for expected_call in [
+            call("/jobs/v1/tool/my-tool/jobs/my-component/restart/", verify=True),
+            call("/jobs/v1/tool/my-tool/jobs/first-component/restart/", verify=True),
+            call("/jobs/v1/tool/my-tool/jobs/second-component/restart/", verify=True),
+        ]:
+            assert expected_call in fake_toolforge_client.post_calls
 
     def test_starts_build_and_reused_image_for_second_component(
-        self, monkeypatch: MonkeyPatch
+        self,
+        runtime: Runtime,
+        storage: Storage,
+        fake_toolforge_client: FakeToolforgeClient,
     ):
-        my_storage = MockStorage()
-        my_tool_config = ToolConfig(
-            config_version="v1beta1",
-            components={
-                "my-component": ContinuousComponentInfo(
-                    build=SourceBuildInfo(
-                        repository="https://gitlab-example.wikimedia.org/my-repo.git",
-                        ref="main",
-                    ),
-                    run=ContinuousRunInfo(
-                        command="my-command",
-                    ),
-                ),
-                "child-component": ContinuousComponentInfo(
-                    build=SourceBuildReference(
-                        reuse_from="my-component",
-                    ),
-                    run=ContinuousRunInfo(
-                        command="my-second-command",
-                    ),
-                ),
-            },
-        )
+        my_tool_config = _ONE_REUSING_COMPONENT_TOOL_CONFIG
         my_deployment = get_deployment_from_tool_config(tool_config=my_tool_config)
-        my_storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
+        storage.create_deployment(tool_name="my-tool", deployment=my_deployment)
 
-        toolforge_client_mock = MagicMock(spec=ToolforgeClient)
-        monkeypatch.setattr(
-            "components.runtime.toolforge.get_toolforge_client",
-            lambda: toolforge_client_mock,
-        )
-        toolforge_client_mock.post.return_value = {"new_build": {"name": "my-build"}}
-        toolforge_client_mock.get.return_value = {
+        fake_toolforge_client.post_return = {"new_build": {"name": "my-build"}}
+        fake_toolforge_client.get_return = {
             "build": {
                 "status": BuildsBuildStatus.BUILD_SUCCESS.value,
                 "destination_image": "tool-my-tool/my-component:latest",
             }
         }
-        toolforge_client_mock.patch.return_value = JobsUpdateResponse(
-            messages=JobsResponseMessages(
-                error=None, info=["created continuous job my-job-name"], warning=None
-            ),
-            job_changed=True,
-        ).model_dump()
-
-        expected_deployments = [
-            Deployment(
-                deploy_id="my-deploy-id",
-                creation_time="2021-06-01T00:00:00",
-                builds={
-                    "my-component": DeploymentBuildInfo(
-                        build_id="my-build",
-                        build_status=DeploymentBuildState.successful,
-                        build_long_status="You can see the logs with `toolforge build logs my-build`",
-                        build_image="tool-my-tool/my-component:latest",
-                    ),
-                    "child-component": DeploymentBuildInfo(
-                        build_id="no-build-needed",
-                        build_status=DeploymentBuildState.skipped,
-                        build_long_status="Component re-uses build from my-component",
-                    ),
+        fake_toolforge_client.patch_return = _JOB_CHANGED_RESPONSE
+
+        expected_deployment = {
+            **_BASE_EXPECTED_DEPLOYMENT,
+            "builds": {
+                "my-component": {
+                    "build_id": "my-build",
+                    "build_status": DeploymentBuildState.successful,
+                    "build_image": "tool-my-tool/my-component:latest",
+                    "build_long_status": "You can see the logs with `toolforge build logs my-build`",
                 },
-                runs={
-                    "my-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.successful,
-                        run_long_status="created or updated job my-component, [info](created continuous job my-job-name)",
-                    ),
-                    "child-component": DeploymentRunInfo(
-                        run_status=DeploymentRunState.successful,
-                        run_long_status="created or updated job child-component, [info](created continuous job my-job-name)",
-                    ),
+                "child-component": {
+                    "build_id": "no-build-needed",
+                    "build_status": DeploymentBuildState.skipped,
+                    "build_image": DeploymentBuildInfo.NO_IMAGE_YET,
+                    "build_long_status": "Component re-uses build from my-component",
                 },
-                tool_config=my_tool_config,
-                status=DeploymentState.successful,
-                long_status="I will not be checked",
-            )
-        ]
+            },
+            "runs": {
+                "my-component": {
+                    "run_status": DeploymentRunState.successful,
+                    "run_long_status": "created or updated job my-component, [info](created continuous job my-job-name)",
+                },
+                "child-component": {
+                    "run_status": DeploymentRunState.successful,
+                    "run_long_status": "created or updated job child-component, [info](created continuous job my-job-name)",
+                },
+            },
+            "tool_config": my_tool_config.model_dump(),
+            "status": DeploymentState.successful,
+        }
 
         do_deploy(
             deployment=my_deployment,
-            storage=my_storage,
+            storage=storage,
             tool_config=my_tool_config,
             tool_name="my-tool",
-            runtime=get_runtime(settings=get_settings()),
+            runtime=runtime,
         )
 
-        gotten_deployments = my_storage.list_deployments(tool_name="my-tool")
+        gotten_deployments = storage.list_deployments(tool_name="my-tool")
 
-        # make sure that we have some deployments
-        assert gotten_deployments
-        expected_deployments[0].long_status = gotten_deployments[0].long_status
-        assert gotten_deployments == expected_deployments
-
-        toolforge_client_mock.patch.assert_has_calls(
-            [
-                call(
-                    "/jobs/v1/tool/my-tool/jobs/",
-                    json={
-                        "job_type": "continuous",
-                        "cmd": "my-command",
-                        "name": "my-component",
-                        "imagename": "tool-my-tool/my-component:latest",
-                    },
-                    verify=True,
-                ),
-                call(
-                    "/jobs/v1/tool/my-tool/jobs/",
-                    json={
-                        "job_type": "continuous",
-                        "cmd": "my-second-command",
-                        "name": "child-component",
-                        "imagename": "tool-my-tool/my-component:latest",
-                    },
-                    verify=True,
-                ),
-            ],
-            any_order=True,
-        )
+        assert_deployments_equal(gotten_deployments, [expected_deployment])
+
+        for expected_call in [
+            call(
+                "/jobs/v1/tool/my-tool/jobs/",
+                json={
+                    "job_type": "continuous",
+                    "cmd": "my-command",
+                    "name": "my-component",
+                    "imagename": "tool-my-tool/my-component:latest",
+                },
+                verify=True,
+            ),
+            call(
+                "/jobs/v1/tool/my-tool/jobs/",
+                json={
+                    "job_type": "continuous",
+                    "cmd": "my-second-command",
+                    "name": "child-component",
+                    "imagename": "tool-my-tool/my-component:latest",
+                },
+                verify=True,
+            ),
+        ]:
+            assert expected_call in fake_toolforge_client.patch_calls
 
 
 class TestExceptionRetry:
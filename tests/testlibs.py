@@ -1,4 +1,12 @@
-from components.gen.toolforge_models import JobsDefinedContinuousJob, JobType5
+import datetime
+from typing import Any, Iterator
+from unittest.mock import call
+
+from components.gen.toolforge_models import (
+    JobsDefinedContinuousJob,
+    JobsJobResponse,
+    JobType5,
+)
 from components.models.api_models import (
     AnyGitUrl,
     ContinuousComponentInfo,
@@ -14,6 +22,114 @@ from components.models.api_models import (
 )
 
 
+class FakeToolforgeClient:
+    """
+    Stand-in for toolforge_weld's ToolforgeClient.
+
+    Each method returns whatever was set in its <method>_return attribute and records the call in
+    <method>_calls, so tests can check them with ex. `fake.patch_calls == [call(...)]`. The exception
+    is get, that is only ever stubbed and gets called in the build polling loop, so its calls are not
+    recorded.
+
+    Setting <method>_side_effect overrides the return value, like it does for mocks: an exception
+    gets raised, an iterable (ex. a tuple) gives one answer per call (raising it if it's an
+    exception) and a function gets called with the same arguments.
+    """
+
+    def __init__(self) -> None:
+        self.get_return: Any = None
+        self.post_return: Any = None
+        self.put_return: Any = None
+        self.patch_return: Any = None
+        self.delete_return: Any = None
+        self.get_side_effect: Any = None
+        self.post_side_effect: Any = None
+        self.put_side_effect: Any = None
+        self.patch_side_effect: Any = None
+        self.delete_side_effect: Any = None
+        self.post_calls: list[Any] = []
+        self.put_calls: list[Any] = []
+        self.patch_calls: list[Any] = []
+        self.delete_calls: list[Any] = []
+
+    def _answer(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        if method != "get":
+            getattr(self, f"{method}_calls").append(call(*args, **kwargs))
+        side_effect = getattr(self, f"{method}_side_effect")
+        if side_effect is None:
+            return getattr(self, f"{method}_return")
+
+        if isinstance(side_effect, BaseException):
+            raise side_effect
+
+        if callable(side_effect):
+            return side_effect(*args, **kwargs)
+
+        if not isinstance(side_effect, Iterator):
+            # keep the iterator so the next call gets the next answer
+            side_effect = iter(side_effect)
+            setattr(self, f"{method}_side_effect", side_effect)
+
+        answer = next(side_effect)
+        if isinstance(answer, BaseException):
+            raise answer
+
+        return answer
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        return self._answer("get", *args, **kwargs)
+
+    def post(self, *args: Any, **kwargs: Any) -> Any:
+        return self._answer("post", *args, **kwargs)
+
+    def put(self, *args: Any, **kwargs: Any) -> Any:
+        return self._answer("put", *args, **kwargs)
+
+    def patch(self, *args: Any, **kwargs: Any) -> Any:
+        return self._answer("patch", *args, **kwargs)
+
+    def delete(self, *args: Any, **kwargs: Any) -> Any:
+        return self._answer("delete", *args, **kwargs)
+
+
+class FakeClock:
+    """
+    Fake clock, its bound now() can stand in for datetime.now.
+
+    Every call to now() returns a time one step later than the previous one, starting at start.
+    """
+
+    def __init__(self, start: datetime.datetime, step: datetime.timedelta) -> None:
+        self._next = start
+        self._step = step
+
+    def now(self, tz: datetime.tzinfo | None = None) -> datetime.datetime:
+        current = self._next
+        self._next += self._step
+        return current
+
+
+# what the jobs api answers when creating/updating/deleting a job
+JOB_RESPONSE = JobsJobResponse().model_dump()
+
+
+def assert_deployments_equal(
+    got: list[Deployment],
+    expected: list[dict[str, Any]],
+    *,
+    ignore: frozenset[str] = frozenset({"long_status"}),
+) -> None:
+    """
+    Compare deployments to the expected model_dump() of each, skipping the ignored fields.
+
+    long_status is ignored by default as it includes timestamps.
+    """
+    assert expected, "expected at least one deployment"
+    assert [
+        deployment.model_dump(exclude=set(ignore)) for deployment in got
+    ] == expected
+
+
 def get_deployment_from_tool_config(
     *,
     tool_config: ToolConfig,
@@ -22,28 +138,25 @@ def get_deployment_from_tool_config(
     with_deployment_state: DeploymentState | None = None,
     **overrides,
 ) -> Deployment:
+    build_status = (
+        with_build_state
+        if with_build_state is not None
+        else DeploymentBuildState.pending
+    )
+    run_status = (
+        with_run_state if with_run_state is not None else DeploymentRunState.pending
+    )
+    builds = {}
+    runs = {}
+    for component_name in tool_config.components:
+        builds[component_name] = DeploymentBuildInfo(
+            build_id="my-build-id", build_status=build_status
+        )
+        runs[component_name] = DeploymentRunInfo(run_status=run_status)
+
     params = dict(
-        builds={
-            component_name: DeploymentBuildInfo(
-                build_id="my-build-id",
-                build_status=(
-                    with_build_state
-                    if with_build_state is not None
-                    else DeploymentBuildState.pending
-                ),
-            )
-            for component_name in tool_config.components.keys()
-        },
-        runs={
-            component_name: DeploymentRunInfo(
-                run_status=(
-                    with_run_state
-                    if with_run_state is not None
-                    else DeploymentRunState.pending
-                )
-            )
-            for component_name in tool_config.components.keys()
-        },
+        builds=builds,
+        runs=runs,
         tool_config=tool_config,
         deploy_id="my-deploy-id",
         creation_time="2021-06-01T00:00:00",
@@ -58,8 +171,8 @@ def get_deployment_from_tool_config(
     return Deployment(**params)  # type: ignore
 
 
-def get_tool_config(**overrides) -> ToolConfig:
-    params = dict(
+def _get_tool_config_params() -> dict[str, Any]:
+    return dict(
         config_version="v1beta1",
         components={
             "my-component": ContinuousComponentInfo(
@@ -75,6 +188,16 @@ def get_tool_config(**overrides) -> ToolConfig:
             )
         },
     )
+
+
+_DEFAULT_TOOL_CONFIG = ToolConfig(**_get_tool_config_params())
+
+
+def get_tool_config(**overrides) -> ToolConfig:
+    if not overrides:
+        return _DEFAULT_TOOL_CONFIG.model_copy(deep=True)
+
+    params = _get_tool_config_params()
     params.update(overrides)
     return ToolConfig(**params)  # type: ignore
 
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import json
 import sys
-from copy import deepcopy
 from pathlib import Path
 
 import jsonref  # type: ignore
@@ -12,8 +11,12 @@ CURDIR = Path(__file__).parent
 
 
 def main() -> None:
-    spec = yaml.safe_load(Path(f"{CURDIR}/../openapi/openapi.yaml").open())
-    resolved = jsonref.JsonRef.replace_refs(spec)
+    # the libyaml loader is a lot faster, but not every PyYAML build has it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with Path(f"{CURDIR}/../openapi/openapi.yaml").open("rb") as spec_file:
+        spec = yaml.load(spec_file, Loader=loader)
+    # plain dicts instead of lazy proxies, so the result can be dumped as is
+    resolved = jsonref.replace_refs(spec, proxies=False)
 
     node = resolved
     for key in TOOL_CONFIG_PATH:
@@ -22,8 +25,8 @@ def main() -> None:
             print(f"Path {'.'.join(TOOL_CONFIG_PATH)} not found.", file=sys.stderr)
             sys.exit(1)
 
-    # we need to create a standard dict, the one returned by jsonref is not serializable
-    print(json.dumps(deepcopy(node), indent=2))
+    json.dump(node, sys.stdout, indent=2)
+    sys.stdout.write("\n")
 
 
 if __name__ == "__main__":